@@ -1,5 +1,8 @@
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Union
+from collections import defaultdict
 from datetime import datetime
+from operator import itemgetter
+import numpy as np
 
 from models import (
     ContentItem, 
@@ -10,6 +13,106 @@ from models import (
 )
 
 
+# Bound once so the generators skip the class attribute lookup per insight
+_create_insight = PerformanceInsight.create
+
+# Display names for the closed Platform and ContentType enums
+PLATFORM_NAMES = {platform: platform.value.capitalize() for platform in Platform}
+CONTENT_TYPE_NAMES = {content_type: content_type.value.capitalize() for content_type in ContentType}
+
+# Descriptions of the content length categories used by PatternAnalyzer
+LENGTH_DESCRIPTIONS = {
+    "short": "short (less than 100 characters)",
+    "medium": "medium (100-500 characters)",
+    "long": "long (more than 500 characters)"
+}
+LENGTH_DESCRIPTIONS_CAPITALIZED = {k: v.capitalize() for k, v in LENGTH_DESCRIPTIONS.items()}
+
+# Seasons in reporting order, and the season each month belongs to
+SEASONS = ("Winter", "Spring", "Summer", "Fall")
+MONTH_TO_SEASON = {
+    "December": "Winter", "January": "Winter", "February": "Winter",
+    "March": "Spring", "April": "Spring", "May": "Spring",
+    "June": "Summer", "July": "Summer", "August": "Summer",
+    "September": "Fall", "October": "Fall", "November": "Fall",
+}
+
+# Display names for growth metrics, keyed by the substring that identifies them
+# (checked in order), plus the keyword for the exact keys produced by MetricsAnalyzer
+GROWTH_METRIC_KEYWORDS = {
+    "views": "Views",
+    "likes": "Likes",
+    "comments": "Comments",
+    "engagement": "Engagement rate",
+}
+GROWTH_METRIC_KEYS = {
+    "avg_views_growth": "views",
+    "avg_likes_growth": "likes",
+    "avg_comments_growth": "comments",
+    "avg_engagement_rate_growth": "engagement",
+}
+
+# Insight types that generate_recommendations turns into specific recommendations
+RECOMMENDATION_INSIGHT_TYPES = frozenset({
+    "content_type",
+    "platform",
+    "topics",
+    "hashtags",
+    "content_length",
+    "optimal_posting_schedule",
+    "decline",
+})
+
+# Fallback recommendations used when there are few specific ones
+GENERAL_RECOMMENDATIONS = (
+    "Experiment with different content formats to identify what resonates best with your audience.",
+    "Engage with your audience by responding to comments to boost overall engagement.",
+    "Analyze your competitors' top-performing content for inspiration.",
+)
+
+
+def _as_mapping(performance) -> Dict[Any, float]:
+    """
+    Get performance data as a dictionary, in input order.
+    
+    Dictionary input is returned as-is rather than copied.
+    
+    Args:
+        performance: Dictionary mapping keys to engagement rates, or a
+            (keys, rates) pair of arrays from vectorized aggregation
+            
+    Returns:
+        Dictionary mapping keys to engagement rates
+    """
+    if isinstance(performance, tuple):
+        keys, rates = performance
+        return dict(zip(keys, np.asarray(rates, dtype=float).tolist()))
+    
+    return performance
+
+
+def _rank_performance(performance) -> List[Tuple[Any, float]]:
+    """
+    Rank (key, engagement_rate) pairs from best to worst.
+    
+    Array input is ranked with NumPy; ties keep their input order either way.
+    
+    Args:
+        performance: Dictionary mapping keys to engagement rates, or a
+            (keys, rates) pair of arrays from vectorized aggregation
+            
+    Returns:
+        List of (key, engagement_rate) tuples, best first
+    """
+    if isinstance(performance, tuple):
+        keys, rates = performance
+        rates = np.asarray(rates, dtype=float)
+        order = np.argsort(-rates, kind="stable")
+        return [(keys[i], rates[i].item()) for i in order]
+    
+    return sorted(performance.items(), key=itemgetter(1), reverse=True)
+
+
 class InsightGenerator:
     """
     Generator for insights based on content performance analysis.
@@ -21,89 +124,94 @@ class InsightGenerator:
         """
         pass
     
-    def generate_content_type_insights(self, content_type_performance: Dict[ContentType, float]) -> List[PerformanceInsight]:
+    @staticmethod
+    def generate_content_type_insights(content_type_performance: Union[Dict[ContentType, float], Tuple[np.ndarray, np.ndarray]]) -> List[PerformanceInsight]:
         """
         Generate insights based on content type performance.
         
         Args:
-            content_type_performance: Dictionary mapping content types to average engagement rates
+            content_type_performance: Dictionary mapping content types to average engagement rates,
+                or a (content_types, rates) pair of arrays
             
         Returns:
             List of PerformanceInsight objects
         """
-        if not content_type_performance:
+        # Rank entries once; the first one is the best performing content type
+        sorted_types = _rank_performance(content_type_performance)
+        
+        if not sorted_types:
             return []
         
         insights = []
+        supporting_data = {"content_type_performance": {k.value: v for k, v in _as_mapping(content_type_performance).items()}}
         
-        # Find best performing content type
-        best_type = max(content_type_performance.items(), key=lambda x: x[1])
+        best_type = sorted_types[0]
         
-        insights.append(PerformanceInsight.create(
+        insights.append(_create_insight(
             insight_type="content_type",
-            description=f"{best_type[0].value.capitalize()} content performs best with an average engagement rate of {best_type[1]:.2f}%.",
+            description=f"{CONTENT_TYPE_NAMES[best_type[0]]} content performs best with an average engagement rate of {best_type[1]:.2f}%.",
             confidence=0.8,
-            supporting_data={"content_type_performance": {k.value: v for k, v in content_type_performance.items()}}
+            supporting_data=supporting_data
         ))
         
         # Compare content types
-        if len(content_type_performance) > 1:
-            sorted_types = sorted(content_type_performance.items(), key=lambda x: x[1], reverse=True)
+        if len(sorted_types) > 1:
+            comparison = "Content type performance ranking: " + ", ".join(f"{CONTENT_TYPE_NAMES[t[0]]} ({t[1]:.2f}%)" for t in sorted_types)
             
-            comparison = f"Content type performance ranking: "
-            comparison += ", ".join([f"{t[0].value.capitalize()} ({t[1]:.2f}%)" for t in sorted_types])
-            
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="content_type_comparison",
                 description=comparison,
                 confidence=0.7,
-                supporting_data={"content_type_performance": {k.value: v for k, v in content_type_performance.items()}}
+                supporting_data=supporting_data
             ))
         
         return insights
     
-    def generate_platform_insights(self, platform_performance: Dict[Platform, float]) -> List[PerformanceInsight]:
+    @staticmethod
+    def generate_platform_insights(platform_performance: Union[Dict[Platform, float], Tuple[np.ndarray, np.ndarray]]) -> List[PerformanceInsight]:
         """
         Generate insights based on platform performance.
         
         Args:
-            platform_performance: Dictionary mapping platforms to average engagement rates
+            platform_performance: Dictionary mapping platforms to average engagement rates,
+                or a (platforms, rates) pair of arrays
             
         Returns:
             List of PerformanceInsight objects
         """
-        if not platform_performance:
+        # Rank entries once; the first one is the best performing platform
+        sorted_platforms = _rank_performance(platform_performance)
+        
+        if not sorted_platforms:
             return []
         
         insights = []
+        supporting_data = {"platform_performance": {k.value: v for k, v in _as_mapping(platform_performance).items()}}
         
-        # Find best performing platform
-        best_platform = max(platform_performance.items(), key=lambda x: x[1])
+        best_platform = sorted_platforms[0]
         
-        insights.append(PerformanceInsight.create(
+        insights.append(_create_insight(
             insight_type="platform",
-            description=f"{best_platform[0].value.capitalize()} performs best with an average engagement rate of {best_platform[1]:.2f}%.",
+            description=f"{PLATFORM_NAMES[best_platform[0]]} performs best with an average engagement rate of {best_platform[1]:.2f}%.",
             confidence=0.8,
-            supporting_data={"platform_performance": {k.value: v for k, v in platform_performance.items()}}
+            supporting_data=supporting_data
         ))
         
         # Compare platforms
-        if len(platform_performance) > 1:
-            sorted_platforms = sorted(platform_performance.items(), key=lambda x: x[1], reverse=True)
+        if len(sorted_platforms) > 1:
+            comparison = "Platform performance ranking: " + ", ".join(f"{PLATFORM_NAMES[p[0]]} ({p[1]:.2f}%)" for p in sorted_platforms)
             
-            comparison = f"Platform performance ranking: "
-            comparison += ", ".join([f"{p[0].value.capitalize()} ({p[1]:.2f}%)" for p in sorted_platforms])
-            
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="platform_comparison",
                 description=comparison,
                 confidence=0.7,
-                supporting_data={"platform_performance": {k.value: v for k, v in platform_performance.items()}}
+                supporting_data=supporting_data
             ))
         
         return insights
     
-    def generate_topic_insights(self, popular_topics: List[Tuple[str, float]]) -> List[PerformanceInsight]:
+    @staticmethod
+    def generate_topic_insights(popular_topics: List[Tuple[str, float]]) -> List[PerformanceInsight]:
         """
         Generate insights based on popular topics.
         
@@ -117,31 +225,34 @@ class InsightGenerator:
             return []
         
         insights = []
+        supporting_data = {"popular_topics": popular_topics}
         
         # Generate insight for top topic
         top_topic = popular_topics[0]
         
-        insights.append(PerformanceInsight.create(
+        insights.append(_create_insight(
             insight_type="topic",
             description=f"Content about '{top_topic[0]}' performs best with an average engagement rate of {top_topic[1]:.2f}%.",
             confidence=0.7,
-            supporting_data={"popular_topics": [(t[0], t[1]) for t in popular_topics]}
+            supporting_data=supporting_data
         ))
         
         # Generate insight for all top topics
         if len(popular_topics) > 1:
-            topics_list = ", ".join([f"'{t[0]}'" for t in popular_topics[:3]])
+            top_topics = popular_topics[:3]
+            topics_list = ", ".join(f"'{t[0]}'" for t in top_topics)
             
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="topics",
                 description=f"Top performing topics include {topics_list}. Consider creating more content around these topics.",
                 confidence=0.6,
-                supporting_data={"popular_topics": [(t[0], t[1]) for t in popular_topics]}
+                supporting_data=supporting_data
             ))
         
         return insights
     
-    def generate_hashtag_insights(self, popular_hashtags: List[Tuple[str, float]]) -> List[PerformanceInsight]:
+    @staticmethod
+    def generate_hashtag_insights(popular_hashtags: List[Tuple[str, float]]) -> List[PerformanceInsight]:
         """
         Generate insights based on popular hashtags.
         
@@ -155,78 +266,77 @@ class InsightGenerator:
             return []
         
         insights = []
+        supporting_data = {"popular_hashtags": popular_hashtags}
         
         # Generate insight for top hashtag
         top_hashtag = popular_hashtags[0]
         
-        insights.append(PerformanceInsight.create(
+        insights.append(_create_insight(
             insight_type="hashtag",
             description=f"Content with the hashtag '#{top_hashtag[0]}' performs best with an average engagement rate of {top_hashtag[1]:.2f}%.",
             confidence=0.7,
-            supporting_data={"popular_hashtags": [(h[0], h[1]) for h in popular_hashtags]}
+            supporting_data=supporting_data
         ))
         
         # Generate insight for all top hashtags
         if len(popular_hashtags) > 1:
-            hashtags_list = ", ".join([f"#{h[0]}" for h in popular_hashtags[:5]])
+            top_hashtags = popular_hashtags[:5]
+            hashtags_list = ", ".join(f"#{h[0]}" for h in top_hashtags)
             
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="hashtags",
                 description=f"Top performing hashtags include {hashtags_list}. Consider using these hashtags in future content.",
                 confidence=0.6,
-                supporting_data={"popular_hashtags": [(h[0], h[1]) for h in popular_hashtags]}
+                supporting_data=supporting_data
             ))
         
         return insights
     
-    def generate_content_length_insights(self, length_performance: Dict[str, float]) -> List[PerformanceInsight]:
+    @staticmethod
+    def generate_content_length_insights(length_performance: Union[Dict[str, float], Tuple[np.ndarray, np.ndarray]]) -> List[PerformanceInsight]:
         """
         Generate insights based on content length performance.
         
         Args:
-            length_performance: Dictionary mapping length categories to average engagement rates
+            length_performance: Dictionary mapping length categories to average engagement rates,
+                or a (length_categories, rates) pair of arrays
             
         Returns:
             List of PerformanceInsight objects
         """
-        if not length_performance:
+        # Rank entries once; the first one is the best performing length category
+        sorted_lengths = _rank_performance(length_performance)
+        
+        if not sorted_lengths:
             return []
         
         insights = []
+        supporting_data = {"length_performance": _as_mapping(length_performance)}
         
-        # Find best performing length category
-        best_length = max(length_performance.items(), key=lambda x: x[1])
+        best_length = sorted_lengths[0]
         
-        length_descriptions = {
-            "short": "short (less than 100 characters)",
-            "medium": "medium (100-500 characters)",
-            "long": "long (more than 500 characters)"
-        }
-        
-        insights.append(PerformanceInsight.create(
+        insights.append(_create_insight(
             insight_type="content_length",
-            description=f"{length_descriptions[best_length[0]].capitalize()} content performs best with an average engagement rate of {best_length[1]:.2f}%.",
+            description=f"{LENGTH_DESCRIPTIONS_CAPITALIZED[best_length[0]]} content performs best with an average engagement rate of {best_length[1]:.2f}%.",
             confidence=0.7,
-            supporting_data={"length_performance": length_performance}
+            supporting_data=supporting_data
         ))
         
         # Compare length categories
-        if len(length_performance) > 1:
-            sorted_lengths = sorted(length_performance.items(), key=lambda x: x[1], reverse=True)
-            
-            comparison = f"Content length performance ranking: "
-            comparison += ", ".join([f"{length_descriptions[l[0]]} ({l[1]:.2f}%)" for l in sorted_lengths])
+        if len(sorted_lengths) > 1:
+            comparison = "Content length performance ranking: " + ", ".join(f"{LENGTH_DESCRIPTIONS[l[0]]} ({l[1]:.2f}%)" for l in sorted_lengths)
             
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="content_length_comparison",
                 description=comparison,
                 confidence=0.6,
-                supporting_data={"length_performance": length_performance}
+                supporting_data=supporting_data
             ))
         
         return insights
     
-    def generate_posting_time_insights(self, best_posting_times: Dict[str, Any]) -> List[PerformanceInsight]:
+    @staticmethod
+    def generate_posting_time_insights(best_posting_times: Dict[str, Any]) -> List[PerformanceInsight]:
         """
         Generate insights based on best posting times.
         
@@ -240,69 +350,65 @@ class InsightGenerator:
             return []
         
         insights = []
+        supporting_data = {"best_posting_times": best_posting_times}
         
         best_day = best_posting_times.get("best_day")
         best_hour = best_posting_times.get("best_hour")
         
+        if best_hour is not None:
+            # Convert 24-hour format to 12-hour format
+            hour_12 = best_hour % 12 or 12
+            am_pm = "AM" if best_hour < 12 else "PM"
+        
         if best_day:
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="posting_day",
                 description=f"Content posted on {best_day} tends to perform better than other days.",
                 confidence=0.6,
-                supporting_data={"best_posting_times": best_posting_times}
+                supporting_data=supporting_data
             ))
         
         if best_hour is not None:
-            # Convert 24-hour format to 12-hour format
-            hour_12 = best_hour % 12
-            if hour_12 == 0:
-                hour_12 = 12
-            
-            am_pm = "AM" if best_hour < 12 else "PM"
-            
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="posting_time",
                 description=f"Content posted around {hour_12} {am_pm} tends to perform better than other times.",
                 confidence=0.6,
-                supporting_data={"best_posting_times": best_posting_times}
+                supporting_data=supporting_data
             ))
         
         if best_day and best_hour is not None:
-            # Convert 24-hour format to 12-hour format
-            hour_12 = best_hour % 12
-            if hour_12 == 0:
-                hour_12 = 12
-            
-            am_pm = "AM" if best_hour < 12 else "PM"
-            
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="optimal_posting_schedule",
                 description=f"For optimal engagement, consider posting on {best_day} around {hour_12} {am_pm}.",
                 confidence=0.7,
-                supporting_data={"best_posting_times": best_posting_times}
+                supporting_data=supporting_data
             ))
         
         return insights
     
-    def generate_seasonal_insights(self, seasonal_performance: Dict[str, float]) -> List[PerformanceInsight]:
+    @staticmethod
+    def generate_seasonal_insights(seasonal_performance: Union[Dict[str, float], Tuple[np.ndarray, np.ndarray]]) -> List[PerformanceInsight]:
         """
         Generate insights based on seasonal performance.
         
         Args:
-            seasonal_performance: Dictionary mapping months to average engagement rates
+            seasonal_performance: Dictionary mapping months to average engagement rates,
+                or a (months, rates) pair of arrays
             
         Returns:
             List of PerformanceInsight objects
         """
+        seasonal_performance = _as_mapping(seasonal_performance)
+        
         if not seasonal_performance:
             return []
         
         insights = []
         
         # Find best performing month
-        best_month = max(seasonal_performance.items(), key=lambda x: x[1])
+        best_month = max(seasonal_performance.items(), key=itemgetter(1))
         
-        insights.append(PerformanceInsight.create(
+        insights.append(_create_insight(
             insight_type="seasonal",
             description=f"Content posted in {best_month[0]} performs best with an average engagement rate of {best_month[1]:.2f}%.",
             confidence=0.6,
@@ -310,30 +416,27 @@ class InsightGenerator:
         ))
         
         # Group months into seasons
-        winter = ["December", "January", "February"]
-        spring = ["March", "April", "May"]
-        summer = ["June", "July", "August"]
-        fall = ["September", "October", "November"]
-        
-        seasons = {
-            "Winter": [seasonal_performance.get(month, 0) for month in winter if month in seasonal_performance],
-            "Spring": [seasonal_performance.get(month, 0) for month in spring if month in seasonal_performance],
-            "Summer": [seasonal_performance.get(month, 0) for month in summer if month in seasonal_performance],
-            "Fall": [seasonal_performance.get(month, 0) for month in fall if month in seasonal_performance]
-        }
+        season_sums = {season: 0.0 for season in SEASONS}
+        season_counts = {season: 0 for season in SEASONS}
         
-        # Calculate average engagement rate for each season
-        season_performance = {}
+        for month, rate in seasonal_performance.items():
+            season = MONTH_TO_SEASON.get(month)
+            if season is not None:
+                season_sums[season] += rate
+                season_counts[season] += 1
         
-        for season, rates in seasons.items():
-            if rates:
-                season_performance[season] = sum(rates) / len(rates)
+        # Calculate average engagement rate for each season
+        season_performance = {
+            season: season_sums[season] / season_counts[season]
+            for season in SEASONS
+            if season_counts[season]
+        }
         
         if season_performance:
             # Find best performing season
-            best_season = max(season_performance.items(), key=lambda x: x[1])
+            best_season = max(season_performance.items(), key=itemgetter(1))
             
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="seasonal_trend",
                 description=f"{best_season[0]} months tend to have higher engagement rates (avg: {best_season[1]:.2f}%).",
                 confidence=0.5,
@@ -342,7 +445,8 @@ class InsightGenerator:
         
         return insights
     
-    def generate_growth_insights(self, growth_rates: Dict[str, float]) -> List[PerformanceInsight]:
+    @staticmethod
+    def generate_growth_insights(growth_rates: Dict[str, float]) -> List[PerformanceInsight]:
         """
         Generate insights based on growth rates.
         
@@ -356,47 +460,50 @@ class InsightGenerator:
             return []
         
         insights = []
+        supporting_data = {"growth_rates": growth_rates}
+        
+        total_growth = 0.0
         
         # Generate insights for each growth metric
         for metric, rate in growth_rates.items():
-            if "views" in metric:
-                metric_name = "Views"
-            elif "likes" in metric:
-                metric_name = "Likes"
-            elif "comments" in metric:
-                metric_name = "Comments"
-            elif "engagement" in metric:
-                metric_name = "Engagement rate"
+            total_growth += rate
+            metric_key = GROWTH_METRIC_KEYS.get(metric)
+            
+            if metric_key is None:
+                metric_key = next((k for k in GROWTH_METRIC_KEYWORDS if k in metric), None)
+            
+            if metric_key is not None:
+                metric_name = GROWTH_METRIC_KEYWORDS[metric_key]
             else:
                 metric_name = metric.replace("_growth", "").capitalize()
             
             if rate > 0:
-                insights.append(PerformanceInsight.create(
+                insights.append(_create_insight(
                     insight_type="growth",
                     description=f"{metric_name} increased by {rate:.2f}% compared to the previous period.",
                     confidence=0.7,
-                    supporting_data={"growth_rates": growth_rates}
+                    supporting_data=supporting_data
                 ))
             elif rate < 0:
-                insights.append(PerformanceInsight.create(
+                insights.append(_create_insight(
                     insight_type="decline",
                     description=f"{metric_name} decreased by {abs(rate):.2f}% compared to the previous period.",
                     confidence=0.7,
-                    supporting_data={"growth_rates": growth_rates}
+                    supporting_data={"growth_rates": growth_rates, "metric_key": metric_key}
                 ))
         
         # Generate overall growth insight
-        avg_growth = sum(growth_rates.values()) / len(growth_rates)
+        avg_growth = total_growth / len(growth_rates)
         
         if avg_growth > 5:
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="overall_growth",
                 description=f"Overall performance is improving with an average growth of {avg_growth:.2f}% across all metrics.",
                 confidence=0.6,
                 supporting_data={"growth_rates": growth_rates, "avg_growth": avg_growth}
             ))
         elif avg_growth < -5:
-            insights.append(PerformanceInsight.create(
+            insights.append(_create_insight(
                 insight_type="overall_decline",
                 description=f"Overall performance is declining with an average decrease of {abs(avg_growth):.2f}% across all metrics.",
                 confidence=0.6,
@@ -405,7 +512,8 @@ class InsightGenerator:
         
         return insights
     
-    def generate_recommendations(self, insights: List[PerformanceInsight]) -> List[str]:
+    @staticmethod
+    def generate_recommendations(insights: List[PerformanceInsight]) -> List[str]:
         """
         Generate recommendations based on insights.
         
@@ -420,14 +528,23 @@ class InsightGenerator:
         
         recommendations = []
         
+        # Bucket insights by type in a single pass
+        insights_by_type = defaultdict(list)
+        for insight in insights:
+            insights_by_type[insight.insight_type].append(insight)
+        
+        # Nothing to base specific recommendations on
+        if insights_by_type.keys().isdisjoint(RECOMMENDATION_INSIGHT_TYPES):
+            return list(GENERAL_RECOMMENDATIONS)
+        
         # Process insights by type
-        content_type_insights = [i for i in insights if i.insight_type == "content_type"]
-        platform_insights = [i for i in insights if i.insight_type == "platform"]
-        topic_insights = [i for i in insights if i.insight_type == "topic" or i.insight_type == "topics"]
-        hashtag_insights = [i for i in insights if i.insight_type == "hashtag" or i.insight_type == "hashtags"]
-        length_insights = [i for i in insights if i.insight_type == "content_length"]
-        time_insights = [i for i in insights if i.insight_type == "optimal_posting_schedule"]
-        growth_insights = [i for i in insights if i.insight_type == "growth" or i.insight_type == "decline"]
+        content_type_insights = insights_by_type["content_type"]
+        platform_insights = insights_by_type["platform"]
+        topic_insights = insights_by_type["topics"]
+        hashtag_insights = insights_by_type["hashtags"]
+        length_insights = insights_by_type["content_length"]
+        time_insights = insights_by_type["optimal_posting_schedule"]
+        decline_insights = insights_by_type["decline"]
         
         # Generate recommendations based on content type insights
         if content_type_insights:
@@ -436,7 +553,7 @@ class InsightGenerator:
             content_type_performance = supporting_data.get("content_type_performance", {})
             
             if content_type_performance:
-                best_type = max(content_type_performance.items(), key=lambda x: x[1])[0]
+                best_type = max(content_type_performance.items(), key=itemgetter(1))[0]
                 recommendations.append(f"Create more {best_type} content to maximize engagement.")
         
         # Generate recommendations based on platform insights
@@ -446,36 +563,28 @@ class InsightGenerator:
             platform_performance = supporting_data.get("platform_performance", {})
             
             if platform_performance:
-                best_platform = max(platform_performance.items(), key=lambda x: x[1])[0]
+                best_platform = max(platform_performance.items(), key=itemgetter(1))[0]
                 recommendations.append(f"Focus more on {best_platform.capitalize()} where your content performs best.")
         
         # Generate recommendations based on topic insights
         if topic_insights:
-            for insight in topic_insights:
-                if insight.insight_type == "topics":
-                    supporting_data = insight.supporting_data or {}
-                    popular_topics = supporting_data.get("popular_topics", [])
-                    
-                    if popular_topics:
-                        topics = [t[0] for t in popular_topics[:3]]
-                        topics_str = ", ".join([f"'{t}'" for t in topics])
-                        recommendations.append(f"Create more content around popular topics: {topics_str}.")
-                    
-                    break
+            insight = topic_insights[0]
+            supporting_data = insight.supporting_data or {}
+            popular_topics = supporting_data.get("popular_topics", [])
+            
+            if popular_topics:
+                topics_str = ", ".join(f"'{t[0]}'" for t in popular_topics[:3])
+                recommendations.append(f"Create more content around popular topics: {topics_str}.")
         
         # Generate recommendations based on hashtag insights
         if hashtag_insights:
-            for insight in hashtag_insights:
-                if insight.insight_type == "hashtags":
-                    supporting_data = insight.supporting_data or {}
-                    popular_hashtags = supporting_data.get("popular_hashtags", [])
-                    
-                    if popular_hashtags:
-                        hashtags = [h[0] for h in popular_hashtags[:5]]
-                        hashtags_str = ", ".join([f"#{h}" for h in hashtags])
-                        recommendations.append(f"Use these high-performing hashtags in your content: {hashtags_str}.")
-                    
-                    break
+            insight = hashtag_insights[0]
+            supporting_data = insight.supporting_data or {}
+            popular_hashtags = supporting_data.get("popular_hashtags", [])
+            
+            if popular_hashtags:
+                hashtags_str = ", ".join(f"#{h[0]}" for h in popular_hashtags[:5])
+                recommendations.append(f"Use these high-performing hashtags in your content: {hashtags_str}.")
         
         # Generate recommendations based on content length insights
         if length_insights:
@@ -484,7 +593,7 @@ class InsightGenerator:
             length_performance = supporting_data.get("length_performance", {})
             
             if length_performance:
-                best_length = max(length_performance.items(), key=lambda x: x[1])[0]
+                best_length = max(length_performance.items(), key=itemgetter(1))[0]
                 
                 if best_length == "short":
                     recommendations.append("Keep your content descriptions concise (under 100 characters) for better engagement.")
@@ -499,21 +608,21 @@ class InsightGenerator:
             recommendations.append(insight.description)
         
         # Generate recommendations based on growth insights
-        if growth_insights:
+        if decline_insights:
             declining_metrics = []
             
-            for insight in growth_insights:
-                if insight.insight_type == "decline":
+            for insight in decline_insights:
+                supporting_data = insight.supporting_data or {}
+                
+                if "metric_key" in supporting_data:
+                    metric_key = supporting_data["metric_key"]
+                else:
+                    # Insights created before metric keys were recorded
                     description = insight.description.lower()
-                    
-                    if "views" in description:
-                        declining_metrics.append("views")
-                    elif "likes" in description:
-                        declining_metrics.append("likes")
-                    elif "comments" in description:
-                        declining_metrics.append("comments")
-                    elif "engagement" in description:
-                        declining_metrics.append("engagement")
+                    metric_key = next((k for k in GROWTH_METRIC_KEYWORDS if k in description), None)
+                
+                if metric_key is not None:
+                    declining_metrics.append(metric_key)
             
             if declining_metrics:
                 metrics_str = ", ".join(declining_metrics)
@@ -521,8 +630,6 @@ class InsightGenerator:
         
         # Add general recommendations if we don't have many specific ones
         if len(recommendations) < 3:
-            recommendations.append("Experiment with different content formats to identify what resonates best with your audience.")
-            recommendations.append("Engage with your audience by responding to comments to boost overall engagement.")
-            recommendations.append("Analyze your competitors' top-performing content for inspiration.")
+            recommendations.extend(GENERAL_RECOMMENDATIONS)
         
         return recommendations
@@ -1,9 +1,60 @@
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+from typing import List, Dict, Optional, Any, Callable, Union
+from collections import Counter
+from operator import attrgetter, itemgetter
+import heapq
 import pandas as pd
 import numpy as np
 
 from models import ContentItem, ContentMetrics, Platform
+from .timestamps import parse_published_at, DAY_NAMES
+
+
+# ContentMetrics fields that are averaged, in reporting order
+METRIC_FIELDS = ("views", "likes", "comments", "shares", "saves", "engagement_rate")
+
+# ContentMetrics fields that make up the engagement distribution
+ENGAGEMENT_FIELDS = ("likes", "comments", "shares")
+
+# ContentMetrics fields that are totalled in report summaries
+TOTAL_FIELDS = ("views", "likes", "comments", "shares")
+
+
+def _metric_getter(metric_name: str) -> Callable[[ContentMetrics], Any]:
+    """
+    Build a getter for a metric, defaulting to 0 for unknown metric names.
+    
+    Args:
+        metric_name: Name of the ContentMetrics attribute to read
+        
+    Returns:
+        Function reading the metric from a ContentMetrics object
+    """
+    if metric_name in ContentMetrics.__fields__:
+        return attrgetter(metric_name)
+    
+    return lambda metrics: getattr(metrics, metric_name, 0)
+
+
+def _best_group(keys: np.ndarray, values: np.ndarray, size: int) -> int:
+    """
+    Find the group with the highest average value.
+    
+    Args:
+        keys: Integer group keys in the range [0, size)
+        values: Values aligned with keys
+        size: Number of possible groups
+        
+    Returns:
+        Group key with the highest average; ties go to the key seen first
+    """
+    sums = np.bincount(keys, weights=values, minlength=size)
+    counts = np.bincount(keys, minlength=size)
+    
+    averages = np.full(size, -np.inf)
+    np.divide(sums, counts, out=averages, where=counts > 0)
+    
+    # First key in input order whose group reaches the best average
+    return int(keys[np.argmax(averages[keys] == averages.max())])
 
 
 class MetricsAnalyzer:
@@ -17,6 +68,34 @@ class MetricsAnalyzer:
         """
         pass
     
+    def to_frame(self, metrics: Union[List[ContentMetrics], Dict[str, ContentMetrics]]) -> pd.DataFrame:
+        """
+        Convert metrics to a struct-of-arrays DataFrame.
+        
+        Callers running several analyses over the same metrics can convert them
+        once and pass the frame to the *_df methods.
+        
+        Args:
+            metrics: List of ContentMetrics objects, or dictionary mapping content
+                IDs to ContentMetrics objects
+            
+        Returns:
+            DataFrame with one float column per metric field (NaN when missing)
+            and a platform column, indexed by content ID for a dictionary
+        """
+        get_fields = attrgetter(*METRIC_FIELDS)
+        metrics_list = list(metrics.values()) if isinstance(metrics, dict) else metrics
+        values = np.array([get_fields(m) for m in metrics_list], dtype=np.float64)
+        
+        frame = pd.DataFrame(
+            values.reshape(len(metrics_list), len(METRIC_FIELDS)),
+            columns=list(METRIC_FIELDS),
+            index=pd.Index(list(metrics), dtype=object) if isinstance(metrics, dict) else None
+        )
+        frame["platform"] = [m.platform for m in metrics_list]
+        
+        return frame
+    
     def calculate_average_metrics(self, metrics: List[ContentMetrics]) -> Dict[str, float]:
         """
         Calculate average metrics across all content items.
@@ -30,36 +109,28 @@ class MetricsAnalyzer:
         if not metrics:
             return {}
         
-        # Extract metrics into lists
-        views = [m.views for m in metrics if m.views is not None]
-        likes = [m.likes for m in metrics if m.likes is not None]
-        comments = [m.comments for m in metrics if m.comments is not None]
-        shares = [m.shares for m in metrics if m.shares is not None]
-        saves = [m.saves for m in metrics if m.saves is not None]
-        engagement_rates = [m.engagement_rate for m in metrics if m.engagement_rate is not None]
-        
-        # Calculate averages
-        avg_metrics = {}
-        
-        if views:
-            avg_metrics["avg_views"] = sum(views) / len(views)
-        
-        if likes:
-            avg_metrics["avg_likes"] = sum(likes) / len(likes)
-        
-        if comments:
-            avg_metrics["avg_comments"] = sum(comments) / len(comments)
+        return self.calculate_average_metrics_df(self.to_frame(metrics))
+    
+    def calculate_average_metrics_df(self, frame: pd.DataFrame) -> Dict[str, float]:
+        """
+        Calculate average metrics from metrics already held in a DataFrame.
         
-        if shares:
-            avg_metrics["avg_shares"] = sum(shares) / len(shares)
+        Args:
+            frame: DataFrame with one column per ContentMetrics field; fields
+                without a column are skipped
+            
+        Returns:
+            Dictionary of average metrics
+        """
+        fields = [field for field in METRIC_FIELDS if field in frame.columns]
         
-        if saves:
-            avg_metrics["avg_saves"] = sum(saves) / len(saves)
+        if frame.empty or not fields:
+            return {}
         
-        if engagement_rates:
-            avg_metrics["avg_engagement_rate"] = sum(engagement_rates) / len(engagement_rates)
+        # Calculate averages over the values that are present
+        averages = frame[fields].mean()
         
-        return avg_metrics
+        return {f"avg_{field}": float(value) for field, value in averages.items() if not np.isnan(value)}
     
     def calculate_platform_metrics(self, metrics: List[ContentMetrics]) -> Dict[Platform, Dict[str, float]]:
         """
@@ -74,18 +145,32 @@ class MetricsAnalyzer:
         if not metrics:
             return {}
         
-        # Group metrics by platform
-        platform_metrics = {}
+        return self.calculate_platform_metrics_df(self.to_frame(metrics))
+    
+    def calculate_platform_metrics_df(self, frame: pd.DataFrame) -> Dict[Platform, Dict[str, float]]:
+        """
+        Calculate average metrics grouped by platform from metrics already held in a DataFrame.
         
-        for platform in Platform:
-            platform_metrics[platform] = [m for m in metrics if m.platform == platform]
+        Args:
+            frame: DataFrame from to_frame
+            
+        Returns:
+            Dictionary mapping platforms to their average metrics
+        """
+        if frame.empty:
+            return {}
+        
+        # Calculate average metrics for each platform in one grouped pass
+        platform_averages = frame.groupby("platform", sort=False)[list(METRIC_FIELDS)].mean()
+        
+        platform_rows = platform_averages.to_dict("index")
         
-        # Calculate average metrics for each platform
         result = {}
         
-        for platform, platform_metrics_list in platform_metrics.items():
-            if platform_metrics_list:
-                result[platform] = self.calculate_average_metrics(platform_metrics_list)
+        for platform in Platform:
+            averages = platform_rows.get(platform)
+            if averages is not None:
+                result[platform] = {f"avg_{field}": float(value) for field, value in averages.items() if not np.isnan(value)}
         
         return result
     
@@ -108,20 +193,53 @@ class MetricsAnalyzer:
         if not content_items or not metrics:
             return []
         
-        # Create a list of (content_id, metric_value) tuples
-        content_metrics = []
+        if metric_name in METRIC_FIELDS:
+            return self.identify_top_performing_content_df(content_items, self.to_frame(metrics), metric_name, limit)
+        
+        get_metric = _metric_getter(metric_name)
         
-        for item in content_items:
-            if item.id in metrics:
-                metric_value = getattr(metrics[item.id], metric_name, 0)
-                if metric_value is not None:
-                    content_metrics.append((item.id, metric_value))
+        # Stream (content_id, metric_value) tuples
+        content_metrics = (
+            (item.id, metric_value)
+            for item in content_items
+            if (item_metrics := metrics.get(item.id)) is not None
+            and (metric_value := get_metric(item_metrics)) is not None
+        )
         
-        # Sort by metric value in descending order
-        content_metrics.sort(key=lambda x: x[1], reverse=True)
+        # Select the top values without sorting everything (ties keep input order)
+        top_content = heapq.nlargest(limit, content_metrics, key=itemgetter(1))
         
         # Return top content IDs
-        return [content_id for content_id, _ in content_metrics[:limit]]
+        return [content_id for content_id, _ in top_content]
+    
+    def identify_top_performing_content_df(self, content_items: List[ContentItem], 
+                                          frame: pd.DataFrame, 
+                                          metric_name: str = "engagement_rate",
+                                          limit: int = 5) -> List[str]:
+        """
+        Identify top performing content from metrics already held in a DataFrame.
+        
+        Args:
+            content_items: List of ContentItem objects
+            frame: DataFrame from to_frame, converted from a dictionary so it is
+                indexed by content ID
+            metric_name: Name of the metric field to use for ranking
+            limit: Maximum number of top content items to return
+            
+        Returns:
+            List of content IDs for top performing content
+        """
+        if not content_items or frame.empty:
+            return []
+        
+        # Read the metric column for the content items (NaN when missing)
+        values = frame[metric_name].reindex([item.id for item in content_items])
+        values = values[values.notna()]
+        
+        # Sort by metric value in descending order (ties keep input order)
+        ranked = np.argsort(-values.to_numpy(), kind="stable")[:max(limit, 0)]
+        
+        return values.index[ranked].tolist()
     
     def calculate_growth_rate(self, current_metrics: Dict[str, float], 
                              previous_metrics: Dict[str, float]) -> Dict[str, float]:
@@ -138,14 +256,43 @@ class MetricsAnalyzer:
         if not current_metrics or not previous_metrics:
             return {}
         
-        growth_rates = {}
+        # Only metrics with a positive previous value have a growth rate
+        return {
+            f"{key}_growth": (current - previous) / previous * 100
+            for key, current in current_metrics.items()
+            if (previous := previous_metrics.get(key, 0)) > 0
+        }
+    
+    def calculate_total_metrics(self, metrics: List[ContentMetrics]) -> Dict[str, int]:
+        """
+        Calculate the total views, likes, comments and shares.
         
-        for key in current_metrics:
-            if key in previous_metrics and previous_metrics[key] > 0:
-                growth_rates[f"{key}_growth"] = ((current_metrics[key] - previous_metrics[key]) / 
-                                               previous_metrics[key] * 100)
+        Args:
+            metrics: List of ContentMetrics objects
+            
+        Returns:
+            Dictionary of total metrics (missing values count as 0)
+        """
+        if not metrics:
+            return {f"total_{field}": 0 for field in TOTAL_FIELDS}
         
-        return growth_rates
+        return self.calculate_total_metrics_df(self.to_frame(metrics))
+    
+    def calculate_total_metrics_df(self, frame: pd.DataFrame) -> Dict[str, int]:
+        """
+        Calculate the total views, likes, comments and shares from metrics already
+        held in a DataFrame.
+        
+        Args:
+            frame: DataFrame from to_frame
+            
+        Returns:
+            Dictionary of total metrics (missing values count as 0)
+        """
+        # Sum all totalled fields in one column reduction
+        totals = np.nansum(frame[list(TOTAL_FIELDS)].to_numpy(), axis=0)
+        
+        return {f"total_{field}": int(value) for field, value in zip(TOTAL_FIELDS, totals)}
     
     def calculate_engagement_distribution(self, metrics: List[ContentMetrics]) -> Dict[str, float]:
         """
@@ -160,25 +307,17 @@ class MetricsAnalyzer:
         if not metrics:
             return {}
         
-        # Sum up all engagement metrics
-        total_likes = sum(m.likes or 0 for m in metrics)
-        total_comments = sum(m.comments or 0 for m in metrics)
-        total_shares = sum(m.shares or 0 for m in metrics)
+        # Sum up all engagement metrics in one column reduction (missing values count as 0)
+        totals = np.nansum(self.to_frame(metrics)[list(ENGAGEMENT_FIELDS)].to_numpy(), axis=0)
         
-        total_engagement = total_likes + total_comments + total_shares
+        total_engagement = totals.sum()
         
         if total_engagement == 0:
-            return {
-                "likes_percentage": 0,
-                "comments_percentage": 0,
-                "shares_percentage": 0
-            }
+            return {f"{field}_percentage": 0 for field in ENGAGEMENT_FIELDS}
         
-        return {
-            "likes_percentage": (total_likes / total_engagement) * 100,
-            "comments_percentage": (total_comments / total_engagement) * 100,
-            "shares_percentage": (total_shares / total_engagement) * 100
-        }
+        percentages = totals / total_engagement * 100
+        
+        return {f"{field}_percentage": float(value) for field, value in zip(ENGAGEMENT_FIELDS, percentages)}
     
     def calculate_posting_frequency(self, content_items: List[ContentItem]) -> Dict[str, Any]:
         """
@@ -197,16 +336,10 @@ class MetricsAnalyzer:
                 "most_active_day": None
             }
         
-        # Convert published_at strings to datetime objects
-        dates = []
-        for item in content_items:
-            try:
-                date = datetime.fromisoformat(item.published_at.replace("Z", "+00:00"))
-                dates.append(date)
-            except (ValueError, AttributeError):
-                continue
+        # Get published_at datetimes, dropping any that cannot be parsed
+        dates = parse_published_at(content_items).dropna()
         
-        if not dates or len(dates) < 2:
+        if len(dates) < 2:
             return {
                 "avg_posts_per_week": 0,
                 "avg_posts_per_month": 0,
@@ -214,16 +347,16 @@ class MetricsAnalyzer:
             }
         
         # Sort dates
-        dates.sort()
+        dates = dates.sort_values(ignore_index=True)
         
         # Calculate date range in days
-        date_range_days = (dates[-1] - dates[0]).days
+        date_range_days = (dates.iloc[-1] - dates.iloc[0]).days
         
         if date_range_days == 0:
             return {
                 "avg_posts_per_week": len(dates) * 7,
                 "avg_posts_per_month": len(dates) * 30,
-                "most_active_day": dates[0].strftime("%A")
+                "most_active_day": DAY_NAMES[dates.iloc[0].dayofweek]
             }
         
         # Calculate average posts per week and month
@@ -231,13 +364,9 @@ class MetricsAnalyzer:
         avg_posts_per_week = avg_posts_per_day * 7
         avg_posts_per_month = avg_posts_per_day * 30
         
-        # Find most active day of the week
-        day_counts = {}
-        for date in dates:
-            day_name = date.strftime("%A")
-            day_counts[day_name] = day_counts.get(day_name, 0) + 1
-        
-        most_active_day = max(day_counts.items(), key=lambda x: x[1])[0]
+        # Find most active day of the week (ties go to the earliest posting day)
+        day_counts = Counter(dates.dt.dayofweek.tolist())
+        most_active_day = DAY_NAMES[day_counts.most_common(1)[0][0]]
         
         return {
             "avg_posts_per_week": avg_posts_per_week,
@@ -265,57 +394,31 @@ class MetricsAnalyzer:
                 "best_hour": None
             }
         
-        # Create a list of (hour, day_of_week, metric_value) tuples
-        time_metrics = []
-        
-        for item in content_items:
-            if item.id in metrics:
-                try:
-                    date = datetime.fromisoformat(item.published_at.replace("Z", "+00:00"))
-                    hour = date.hour
-                    day_of_week = date.strftime("%A")
-                    metric_value = getattr(metrics[item.id], metric_name, 0)
-                    
-                    if metric_value is not None:
-                        time_metrics.append((hour, day_of_week, metric_value))
-                except (ValueError, AttributeError):
-                    continue
-        
-        if not time_metrics:
+        get_metric = _metric_getter(metric_name)
+        
+        # Metric value for each content item, NaN when it has none
+        values = pd.Series(
+            [get_metric(item_metrics) if (item_metrics := metrics.get(item.id)) is not None else None
+             for item in content_items],
+            dtype=np.float64
+        )
+        
+        # Only content with a metric value and a parseable publish time counts
+        dates = parse_published_at(content_items)
+        valid = dates.notna() & values.notna()
+        
+        if not valid.any():
             return {
                 "best_day": None,
                 "best_hour": None
             }
         
-        # Group by day of week
-        day_metrics = {}
-        for hour, day, value in time_metrics:
-            if day not in day_metrics:
-                day_metrics[day] = []
-            day_metrics[day].append(value)
-        
-        # Calculate average metric value for each day
-        day_averages = {}
-        for day, values in day_metrics.items():
-            day_averages[day] = sum(values) / len(values)
-        
-        # Find best day
-        best_day = max(day_averages.items(), key=lambda x: x[1])[0]
-        
-        # Group by hour
-        hour_metrics = {}
-        for hour, day, value in time_metrics:
-            if hour not in hour_metrics:
-                hour_metrics[hour] = []
-            hour_metrics[hour].append(value)
-        
-        # Calculate average metric value for each hour
-        hour_averages = {}
-        for hour, values in hour_metrics.items():
-            hour_averages[hour] = sum(values) / len(values)
-        
-        # Find best hour
-        best_hour = max(hour_averages.items(), key=lambda x: x[1])[0]
+        dates = dates[valid]
+        values = values[valid].to_numpy()
+        
+        # Find the day and hour with the best average metric value
+        best_day = DAY_NAMES[_best_group(dates.dt.dayofweek.to_numpy(), values, 7)]
+        best_hour = _best_group(dates.dt.hour.to_numpy(), values, 24)
         
         return {
             "best_day": best_day,
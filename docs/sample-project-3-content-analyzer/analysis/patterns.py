@@ -1,13 +1,28 @@
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Callable
 from collections import Counter
+from operator import attrgetter
 import re
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 import pandas as pd
 import numpy as np
 
 from models import ContentItem, ContentMetrics, Platform, ContentType
+from .timestamps import parse_published_at, MONTH_NAMES
+
+
+# Whole alphabetic words of at least 4 letters; words glued to digits or
+# underscores are skipped, as the tokenizer's isalpha() filter did
+KEYWORD_PATTERN = re.compile(r"\b[^\W\d_]{4,}\b")
+
+# Read ContentMetrics.engagement_rate and the ContentItem grouping fields
+_get_engagement_rate = attrgetter("engagement_rate")
+_get_content_type = attrgetter("content_type")
+_get_platform = attrgetter("platform")
+
+# Description length categories, split at 100 and 500 characters
+LENGTH_CATEGORIES = ("short", "medium", "long")
+LENGTH_BOUNDARIES = (100, 500)
 
 
 class PatternAnalyzer:
@@ -21,22 +36,42 @@ class PatternAnalyzer:
         """
         # Download NLTK resources if needed
         try:
-            nltk.data.find('tokenizers/punkt')
             nltk.data.find('corpora/stopwords')
         except LookupError:
-            nltk.download('punkt')
             nltk.download('stopwords')
         
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = frozenset(stopwords.words('english'))
+    
+    def engagement_rates(self, metrics: Dict[str, ContentMetrics]) -> Dict[str, float]:
+        """
+        Map content IDs to engagement rates, skipping content without one.
+        
+        Callers running several analyses over the same metrics can build the
+        mapping once and pass it to each analysis as rates_by_id.
+        
+        Args:
+            metrics: Dictionary mapping content IDs to ContentMetrics objects
+            
+        Returns:
+            Dictionary mapping content IDs to engagement rates
+        """
+        return {
+            content_id: rate
+            for content_id, rate in zip(metrics, map(_get_engagement_rate, metrics.values()))
+            if rate is not None
+        }
     
     def identify_content_type_performance(self, content_items: List[ContentItem], 
-                                         metrics: Dict[str, ContentMetrics]) -> Dict[ContentType, float]:
+                                         metrics: Dict[str, ContentMetrics],
+                                         rates_by_id: Optional[Dict[str, float]] = None) -> Dict[ContentType, float]:
         """
         Identify which content types perform best.
         
         Args:
             content_items: List of ContentItem objects
             metrics: Dictionary mapping content IDs to ContentMetrics objects
+            rates_by_id: Engagement rates from engagement_rates(metrics), built
+                from metrics if omitted
             
         Returns:
             Dictionary mapping content types to average engagement rates
@@ -44,35 +79,22 @@ class PatternAnalyzer:
         if not content_items or not metrics:
             return {}
         
-        # Group content by type
-        content_by_type = {}
-        
-        for item in content_items:
-            if item.content_type not in content_by_type:
-                content_by_type[item.content_type] = []
-            
-            if item.id in metrics:
-                content_by_type[item.content_type].append(metrics[item.id])
-        
-        # Calculate average engagement rate for each content type
-        result = {}
-        
-        for content_type, content_metrics in content_by_type.items():
-            if content_metrics:
-                engagement_rates = [m.engagement_rate for m in content_metrics if m.engagement_rate is not None]
-                if engagement_rates:
-                    result[content_type] = sum(engagement_rates) / len(engagement_rates)
+        if rates_by_id is None:
+            rates_by_id = self.engagement_rates(metrics)
         
-        return result
+        return self._average_engagement_by(content_items, rates_by_id, _get_content_type)
     
     def identify_platform_performance(self, content_items: List[ContentItem], 
-                                     metrics: Dict[str, ContentMetrics]) -> Dict[Platform, float]:
+                                     metrics: Dict[str, ContentMetrics],
+                                     rates_by_id: Optional[Dict[str, float]] = None) -> Dict[Platform, float]:
         """
         Identify which platforms perform best.
         
         Args:
             content_items: List of ContentItem objects
             metrics: Dictionary mapping content IDs to ContentMetrics objects
+            rates_by_id: Engagement rates from engagement_rates(metrics), built
+                from metrics if omitted
             
         Returns:
             Dictionary mapping platforms to average engagement rates
@@ -80,30 +102,15 @@ class PatternAnalyzer:
         if not content_items or not metrics:
             return {}
         
-        # Group content by platform
-        content_by_platform = {}
-        
-        for item in content_items:
-            if item.platform not in content_by_platform:
-                content_by_platform[item.platform] = []
-            
-            if item.id in metrics:
-                content_by_platform[item.platform].append(metrics[item.id])
-        
-        # Calculate average engagement rate for each platform
-        result = {}
-        
-        for platform, platform_metrics in content_by_platform.items():
-            if platform_metrics:
-                engagement_rates = [m.engagement_rate for m in platform_metrics if m.engagement_rate is not None]
-                if engagement_rates:
-                    result[platform] = sum(engagement_rates) / len(engagement_rates)
+        if rates_by_id is None:
+            rates_by_id = self.engagement_rates(metrics)
         
-        return result
+        return self._average_engagement_by(content_items, rates_by_id, _get_platform)
     
     def identify_popular_topics(self, content_items: List[ContentItem], 
                                metrics: Dict[str, ContentMetrics],
-                               top_n: int = 5) -> List[Tuple[str, float]]:
+                               top_n: int = 5,
+                               rates_by_id: Optional[Dict[str, float]] = None) -> List[Tuple[str, float]]:
         """
         Identify popular topics based on content titles and descriptions.
         
@@ -111,6 +118,8 @@ class PatternAnalyzer:
             content_items: List of ContentItem objects
             metrics: Dictionary mapping content IDs to ContentMetrics objects
             top_n: Number of top topics to return
+            rates_by_id: Engagement rates from engagement_rates(metrics), built
+                from metrics if omitted
             
         Returns:
             List of (topic, average_engagement_rate) tuples
@@ -122,56 +131,32 @@ class PatternAnalyzer:
         keywords = []
         
         for item in content_items:
+            # Collect each keyword once per item, in first-seen order
+            item_keywords = {}
+            
             # Extract keywords from title
             if item.title:
-                title_keywords = self._extract_keywords(item.title)
-                keywords.extend([(kw, item.id) for kw in title_keywords])
+                item_keywords.update(dict.fromkeys(self._extract_keywords(item.title)))
             
             # Extract keywords from description
             if item.description:
-                desc_keywords = self._extract_keywords(item.description)
-                keywords.extend([(kw, item.id) for kw in desc_keywords])
+                item_keywords.update(dict.fromkeys(self._extract_keywords(item.description)))
+            
+            keywords.extend((kw, item.id) for kw in item_keywords)
         
         if not keywords:
             return []
         
-        # Group by keyword
-        keyword_content_ids = {}
-        
-        for keyword, content_id in keywords:
-            if keyword not in keyword_content_ids:
-                keyword_content_ids[keyword] = set()
-            
-            keyword_content_ids[keyword].add(content_id)
-        
-        # Calculate average engagement rate for each keyword
-        keyword_metrics = []
-        
-        for keyword, content_ids in keyword_content_ids.items():
-            # Only consider keywords that appear in multiple content items
-            if len(content_ids) < 2:
-                continue
-            
-            # Calculate average engagement rate
-            engagement_rates = []
-            
-            for content_id in content_ids:
-                if content_id in metrics and metrics[content_id].engagement_rate is not None:
-                    engagement_rates.append(metrics[content_id].engagement_rate)
-            
-            if engagement_rates:
-                avg_engagement_rate = sum(engagement_rates) / len(engagement_rates)
-                keyword_metrics.append((keyword, avg_engagement_rate))
-        
-        # Sort by engagement rate in descending order
-        keyword_metrics.sort(key=lambda x: x[1], reverse=True)
+        if rates_by_id is None:
+            rates_by_id = self.engagement_rates(metrics)
         
         # Return top N keywords
-        return keyword_metrics[:top_n]
+        return self._rank_terms(keywords, rates_by_id, top_n)
     
     def identify_popular_hashtags(self, content_items: List[ContentItem], 
                                  metrics: Dict[str, ContentMetrics],
-                                 top_n: int = 5) -> List[Tuple[str, float]]:
+                                 top_n: int = 5,
+                                 rates_by_id: Optional[Dict[str, float]] = None) -> List[Tuple[str, float]]:
         """
         Identify popular hashtags based on content tags.
         
@@ -179,6 +164,8 @@ class PatternAnalyzer:
             content_items: List of ContentItem objects
             metrics: Dictionary mapping content IDs to ContentMetrics objects
             top_n: Number of top hashtags to return
+            rates_by_id: Engagement rates from engagement_rates(metrics), built
+                from metrics if omitted
             
         Returns:
             List of (hashtag, average_engagement_rate) tuples
@@ -191,53 +178,28 @@ class PatternAnalyzer:
         
         for item in content_items:
             if item.tags:
-                hashtags.extend([(tag, item.id) for tag in item.tags])
+                hashtags.extend((tag, item.id) for tag in dict.fromkeys(item.tags))
         
         if not hashtags:
             return []
         
-        # Group by hashtag
-        hashtag_content_ids = {}
-        
-        for hashtag, content_id in hashtags:
-            if hashtag not in hashtag_content_ids:
-                hashtag_content_ids[hashtag] = set()
-            
-            hashtag_content_ids[hashtag].add(content_id)
-        
-        # Calculate average engagement rate for each hashtag
-        hashtag_metrics = []
-        
-        for hashtag, content_ids in hashtag_content_ids.items():
-            # Only consider hashtags that appear in multiple content items
-            if len(content_ids) < 2:
-                continue
-            
-            # Calculate average engagement rate
-            engagement_rates = []
-            
-            for content_id in content_ids:
-                if content_id in metrics and metrics[content_id].engagement_rate is not None:
-                    engagement_rates.append(metrics[content_id].engagement_rate)
-            
-            if engagement_rates:
-                avg_engagement_rate = sum(engagement_rates) / len(engagement_rates)
-                hashtag_metrics.append((hashtag, avg_engagement_rate))
-        
-        # Sort by engagement rate in descending order
-        hashtag_metrics.sort(key=lambda x: x[1], reverse=True)
+        if rates_by_id is None:
+            rates_by_id = self.engagement_rates(metrics)
         
         # Return top N hashtags
-        return hashtag_metrics[:top_n]
+        return self._rank_terms(hashtags, rates_by_id, top_n)
     
     def identify_content_length_performance(self, content_items: List[ContentItem], 
-                                          metrics: Dict[str, ContentMetrics]) -> Dict[str, float]:
+                                          metrics: Dict[str, ContentMetrics],
+                                          rates_by_id: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """
         Identify how content length affects performance.
         
         Args:
             content_items: List of ContentItem objects
             metrics: Dictionary mapping content IDs to ContentMetrics objects
+            rates_by_id: Engagement rates from engagement_rates(metrics), built
+                from metrics if omitted
             
         Returns:
             Dictionary mapping length categories to average engagement rates
@@ -245,55 +207,45 @@ class PatternAnalyzer:
         if not content_items or not metrics:
             return {}
         
-        # Categorize content by description length
-        short_content = []
-        medium_content = []
-        long_content = []
-        
-        for item in content_items:
-            if item.id not in metrics:
-                continue
-            
-            if not item.description:
-                continue
-            
-            length = len(item.description)
-            
-            if length < 100:
-                short_content.append(metrics[item.id])
-            elif length < 500:
-                medium_content.append(metrics[item.id])
-            else:
-                long_content.append(metrics[item.id])
+        if rates_by_id is None:
+            rates_by_id = self.engagement_rates(metrics)
         
-        # Calculate average engagement rate for each length category
-        result = {}
+        # Pair description lengths with engagement rates
+        rated_items = [
+            (len(item.description), engagement_rate)
+            for item in content_items
+            if item.description and (engagement_rate := rates_by_id.get(item.id)) is not None
+        ]
         
-        if short_content:
-            engagement_rates = [m.engagement_rate for m in short_content if m.engagement_rate is not None]
-            if engagement_rates:
-                result["short"] = sum(engagement_rates) / len(engagement_rates)
+        if not rated_items:
+            return {}
         
-        if medium_content:
-            engagement_rates = [m.engagement_rate for m in medium_content if m.engagement_rate is not None]
-            if engagement_rates:
-                result["medium"] = sum(engagement_rates) / len(engagement_rates)
+        lengths, engagement_rates = np.array(rated_items, dtype=float).T
         
-        if long_content:
-            engagement_rates = [m.engagement_rate for m in long_content if m.engagement_rate is not None]
-            if engagement_rates:
-                result["long"] = sum(engagement_rates) / len(engagement_rates)
+        # Categorize content by description length
+        categories = np.digitize(lengths, LENGTH_BOUNDARIES)
         
-        return result
+        # Calculate average engagement rate for each length category
+        rate_sums = np.bincount(categories, weights=engagement_rates, minlength=len(LENGTH_CATEGORIES))
+        rate_counts = np.bincount(categories, minlength=len(LENGTH_CATEGORIES))
+        
+        return {
+            category: float(rate_sums[index] / rate_counts[index])
+            for index, category in enumerate(LENGTH_CATEGORIES)
+            if rate_counts[index]
+        }
     
     def identify_seasonal_patterns(self, content_items: List[ContentItem], 
-                                  metrics: Dict[str, ContentMetrics]) -> Dict[str, float]:
+                                  metrics: Dict[str, ContentMetrics],
+                                  rates_by_id: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """
         Identify seasonal patterns in content performance.
         
         Args:
             content_items: List of ContentItem objects
             metrics: Dictionary mapping content IDs to ContentMetrics objects
+            rates_by_id: Engagement rates from engagement_rates(metrics), built
+                from metrics if omitted
             
         Returns:
             Dictionary mapping months to average engagement rates
@@ -301,34 +253,108 @@ class PatternAnalyzer:
         if not content_items or not metrics:
             return {}
         
-        # Group content by month
-        content_by_month = {}
+        if rates_by_id is None:
+            rates_by_id = self.engagement_rates(metrics)
         
-        for item in content_items:
-            if item.id not in metrics:
-                continue
-            
-            try:
-                date = datetime.fromisoformat(item.published_at.replace("Z", "+00:00"))
-                month = date.strftime("%B")  # Month name
-                
-                if month not in content_by_month:
-                    content_by_month[month] = []
-                
-                content_by_month[month].append(metrics[item.id])
-            except (ValueError, AttributeError):
-                continue
+        # Engagement rate for each content item with metrics, NaN when missing
+        has_metrics = pd.Series([item.id in metrics for item in content_items], dtype=bool)
+        engagement_rates = pd.Series([rates_by_id.get(item.id) for item in content_items], dtype=np.float64)
+        
+        # Group content by month name, skipping unparseable publish times
+        dates = parse_published_at(content_items)
+        valid = has_metrics & dates.notna()
+        
+        if not valid.any():
+            return {}
+        
+        months = dates[valid].dt.month.to_numpy()
+        rates = engagement_rates[valid].to_numpy()
+        has_rate = ~np.isnan(rates)
         
         # Calculate average engagement rate for each month
-        result = {}
+        rate_sums = np.bincount(months[has_rate], weights=rates[has_rate], minlength=13)
+        rate_counts = np.bincount(months[has_rate], minlength=13)
+        
+        # Months keep the order they are first seen in
+        return {
+            MONTH_NAMES[month]: float(rate_sums[month] / rate_counts[month])
+            for month in dict.fromkeys(months.tolist())
+            if rate_counts[month]
+        }
+    
+    def _average_engagement_by(self, content_items: List[ContentItem], rates_by_id: Dict[str, float],
+                               get_group: Callable[[ContentItem], Any]) -> Dict[Any, float]:
+        """
+        Average engagement rates over groups of content items.
+        
+        Args:
+            content_items: List of ContentItem objects
+            rates_by_id: Dictionary mapping content IDs to engagement rates
+            get_group: Function returning the group of a content item
+            
+        Returns:
+            Dictionary mapping groups to average engagement rates, in the order
+            the groups are first seen
+        """
+        # Number groups in first-seen order so they can be reduced with bincount
+        groups = np.empty(len(content_items), dtype=object)
+        groups[:] = [get_group(item) for item in content_items]
+        group_codes, group_names = pd.factorize(groups)
+        
+        engagement_rates = np.array([rates_by_id.get(item.id) for item in content_items], dtype=float)
+        has_rate = ~np.isnan(engagement_rates)
+        rated_codes = group_codes[has_rate]
+        
+        # Calculate average engagement rate for each group
+        rate_sums = np.bincount(rated_codes, weights=engagement_rates[has_rate], minlength=len(group_names))
+        rate_counts = np.bincount(rated_codes, minlength=len(group_names))
+        
+        return {
+            group: float(rate_sums[index] / rate_counts[index])
+            for index, group in enumerate(group_names)
+            if rate_counts[index]
+        }
+    
+    def _rank_terms(self, terms: List[Tuple[str, str]], rates_by_id: Dict[str, float],
+                    top_n: int) -> List[Tuple[str, float]]:
+        """
+        Rank terms by the average engagement rate of the content they appear in.
+        
+        Args:
+            terms: List of (term, content_id) pairs
+            rates_by_id: Dictionary mapping content IDs to engagement rates
+            top_n: Number of top terms to return
+            
+        Returns:
+            List of (term, average_engagement_rate) tuples
+        """
+        # Count each content item once per term
+        frame = pd.DataFrame(terms, columns=["term", "content_id"]).drop_duplicates(ignore_index=True)
+        
+        # Look up each content item's engagement rate once, then spread it over its terms
+        content_codes, content_ids = pd.factorize(frame["content_id"])
+        content_rates = np.array([rates_by_id.get(content_id) for content_id in content_ids], dtype=float)
+        engagement_rates = content_rates[content_codes]
         
-        for month, month_metrics in content_by_month.items():
-            if month_metrics:
-                engagement_rates = [m.engagement_rate for m in month_metrics if m.engagement_rate is not None]
-                if engagement_rates:
-                    result[month] = sum(engagement_rates) / len(engagement_rates)
+        # Number terms in first-seen order so they can be reduced with bincount
+        term_codes, term_names = pd.factorize(frame["term"])
+        has_rate = ~np.isnan(engagement_rates)
+        rated_codes = term_codes[has_rate]
         
-        return result
+        # Calculate average engagement rate for each term
+        content_counts = np.bincount(term_codes, minlength=len(term_names))
+        rate_sums = np.bincount(rated_codes, weights=engagement_rates[has_rate], minlength=len(term_names))
+        rate_counts = np.bincount(rated_codes, minlength=len(term_names))
+        
+        # Only consider terms that appear in multiple content items
+        keep = (content_counts >= 2) & (rate_counts > 0)
+        averages = rate_sums[keep] / rate_counts[keep]
+        term_names = term_names[keep]
+        
+        # Sort by engagement rate in descending order
+        ranked = np.argsort(-averages, kind="stable")[:top_n]
+        
+        return [(term_names[index], float(averages[index])) for index in ranked]
     
     def _extract_keywords(self, text: str) -> List[str]:
         """
@@ -340,10 +366,7 @@ class PatternAnalyzer:
         Returns:
             List of keywords
         """
-        # Tokenize text
-        tokens = word_tokenize(text.lower())
-        
-        # Remove stop words and non-alphabetic tokens
-        keywords = [word for word in tokens if word.isalpha() and word not in self.stop_words and len(word) > 3]
+        # Find alphabetic words in one regex pass and remove stop words
+        keywords = [word for word in KEYWORD_PATTERN.findall(text.lower()) if word not in self.stop_words]
         
         return keywords
@@ -0,0 +1,43 @@
+from typing import List, Tuple
+from functools import lru_cache
+import pandas as pd
+
+from models import ContentItem
+
+
+# Names for pandas dayofweek (Monday=0) and month (January=1) numbers
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MONTH_NAMES = (None, "January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December")
+
+
+@lru_cache(maxsize=16)
+def _parse_timestamps(timestamps: Tuple[str, ...]) -> pd.Series:
+    """
+    Parse ISO 8601 timestamps in one vectorized call.
+    
+    Args:
+        timestamps: Tuple of ISO 8601 timestamp strings
+    
+    Returns:
+        Series of UTC datetimes, NaT where a timestamp cannot be parsed
+    """
+    return pd.to_datetime(pd.Series(timestamps, dtype=object), utc=True, format="ISO8601", errors="coerce")
+
+
+def parse_published_at(content_items: List[ContentItem]) -> pd.Series:
+    """
+    Parse the published_at timestamps of a batch of content items.
+    
+    Results are cached per batch, so the analyzers can each ask for the dates of
+    the same content items without parsing them again. The returned Series is
+    shared between callers and must not be modified in place.
+    
+    Args:
+        content_items: List of ContentItem objects
+    
+    Returns:
+        Series of UTC datetimes aligned with content_items, NaT where
+        published_at cannot be parsed
+    """
+    return _parse_timestamps(tuple(item.published_at for item in content_items))
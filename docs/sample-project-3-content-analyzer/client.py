@@ -1,6 +1,13 @@
 import os
+import time
 import asyncio
+import logging
+from itertools import chain, islice
+from typing import Iterable, Iterator
 from datetime import datetime, timedelta
+from collections import defaultdict
+from functools import lru_cache, wraps
+from uuid import uuid4
 
 from dotenv import load_dotenv
 from uagents import Agent, Context
@@ -8,6 +15,8 @@ from uagents import Agent, Context
 from models import (
     Platform,
     TimeFrame,
+    PerformanceInsight,
+    PerformanceReport,
     FetchContentRequest,
     FetchContentResponse,
     FetchMetricsRequest,
@@ -29,6 +38,169 @@ CLIENT_ENDPOINT = f"http://localhost:{CLIENT_PORT}/submit"
 # Content analyzer agent address (this would be set after the content analyzer agent is running)
 CONTENT_ANALYZER_ADDRESS = os.getenv("CONTENT_ANALYZER_ADDRESS", "")
 
+# Platforms the content analyzer agent has connectors for
+SUPPORTED_PLATFORMS = (Platform.YOUTUBE, Platform.INSTAGRAM, Platform.TIKTOK)
+
+# Number of content IDs sent per metrics request. uAgents opens a new HTTP
+# session for every ctx.send, so larger batches mean fewer connection setups
+METRICS_BATCH_SIZE = max(1, int(os.getenv("METRICS_BATCH_SIZE", "32")))
+
+# Seconds send_request waits for a response
+RESPONSE_TIMEOUT = 60.0
+
+# Futures of send_request callers, keyed by the correlation ID of their request
+_pending_responses = {}
+
+# Maximum number of follow-up requests that handlers run at the same time
+HANDLER_CONCURRENCY = 8
+
+# Limits follow-up work started by message handlers, and keeps references to
+# the running tasks so they are not garbage collected before they finish
+_handler_semaphore = asyncio.Semaphore(HANDLER_CONCURRENCY)
+_handler_tasks = set()
+
+# Seconds a request stays in flight when no response clears it
+IN_FLIGHT_TIMEOUT = 30.0
+
+# Seconds a received insights or report response is reused for identical requests
+INSIGHTS_CACHE_TTL = float(os.getenv("INSIGHTS_CACHE_TTL", "5"))
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "60"))
+
+# Cached responses keyed by request payload, as (time.monotonic() received, response)
+_response_cache = {}
+
+# Limits of insights requests awaiting a response, keyed by the correlation ID
+# of the request, so each response is cached under the limit it answers
+_insights_limits = {}
+
+# Keys of requests awaiting a response, mapped to the time.monotonic() deadline
+# after which the same request may be sent again
+_in_flight = {}
+
+# time.monotonic() after which _claim_request next drops expired in-flight markers
+_next_in_flight_sweep = 0.0
+
+# In-flight keys of content requests awaiting a response, keyed by the
+# correlation ID of the request, so a response releases only its own request
+_content_request_keys = {}
+
+
+def _claim_request(key: str) -> bool:
+    """
+    Mark a request as in flight unless an identical one is still pending.
+    
+    Args:
+        key: Key identifying the request payload
+        
+    Returns:
+        True if the request should be sent, False if it duplicates a pending one
+    """
+    global _next_in_flight_sweep
+    
+    now = time.monotonic()
+    
+    # Drop markers for requests that never got a response, at most once per
+    # timeout so claiming a batch of keys stays linear
+    if now >= _next_in_flight_sweep:
+        for expired_key in [k for k, deadline in _in_flight.items() if deadline <= now]:
+            del _in_flight[expired_key]
+        for correlation_id in [c for c, k in _content_request_keys.items() if k not in _in_flight]:
+            del _content_request_keys[correlation_id]
+        _next_in_flight_sweep = now + IN_FLIGHT_TIMEOUT
+    
+    if _in_flight.get(key, 0) > now:
+        return False
+    
+    _in_flight[key] = now + IN_FLIGHT_TIMEOUT
+    return True
+
+
+def _get_cached_response(key: str, ttl: float):
+    """
+    Get a cached response that is younger than its TTL.
+    
+    Args:
+        key: Key identifying the request payload
+        ttl: Maximum age of the response in seconds
+        
+    Returns:
+        The cached response, or None if there is no fresh one
+    """
+    entry = _response_cache.get(key)
+    
+    if entry is None or time.monotonic() - entry[0] >= ttl:
+        return None
+    
+    return entry[1]
+
+
+@lru_cache(maxsize=1)
+def _content_date_range(minute: int) -> tuple[str, str]:
+    """
+    Get the content date range (last 30 days) as ISO strings.
+    
+    Args:
+        minute: Current minute since the epoch; the range is computed once per minute
+        
+    Returns:
+        Tuple of (start_date, end_date) ISO strings
+    """
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=30)
+    
+    return start_date.isoformat(), end_date.isoformat()
+
+
+async def _run_bounded(coroutine) -> None:
+    """
+    Run a handler's follow-up coroutine once a concurrency slot is free.
+    
+    Args:
+        coroutine: Coroutine to run
+    """
+    async with _handler_semaphore:
+        await coroutine
+
+
+def _start_background(coroutine) -> None:
+    """
+    Start a handler's follow-up work without blocking message delivery.
+    
+    Args:
+        coroutine: Coroutine to run in the background
+    """
+    task = asyncio.create_task(_run_bounded(coroutine))
+    _handler_tasks.add(task)
+    task.add_done_callback(_handler_tasks.discard)
+
+
+def _batches(values: Iterable[str], size: int) -> Iterator[list[str]]:
+    """
+    Split values into lists of at most size items without materializing them all.
+    
+    Args:
+        values: Values to split
+        size: Maximum number of values per batch
+        
+    Returns:
+        Iterator over the batches
+    """
+    values = iter(values)
+    
+    while batch := list(islice(values, size)):
+        yield batch
+
+
+def _release_requests(keys) -> None:
+    """
+    Clear in-flight markers so the requests can be sent again.
+    
+    Args:
+        keys: Keys identifying the request payloads
+    """
+    for key in keys:
+        _in_flight.pop(key, None)
+
 # Create the client agent
 client_agent = Agent(
     name="content-analyzer-client",
@@ -49,22 +221,79 @@ async def startup(ctx: Context):
         ctx.logger.warning("Content analyzer agent address not configured. Set the CONTENT_ANALYZER_ADDRESS environment variable.")
         return
     
-    # Request content from YouTube
-    await request_content(ctx, [Platform.YOUTUBE])
+    # Request content from every supported platform, a weekly report and insights concurrently;
+    # responses arrive through the message handlers below, and the metrics
+    # request is sent once the content response comes in
+    await asyncio.gather(
+        request_content(ctx, list(SUPPORTED_PLATFORMS)),
+        generate_report(ctx, TimeFrame.WEEK),
+        get_insights(ctx)
+    )
+
+
+def require_address(func):
+    """
+    Make a request helper a logging no-op when the agent address is not configured.
     
-    # Wait a bit for the response
-    await asyncio.sleep(2)
+    The address is read once from the environment at import time, so the check
+    happens when the helper is defined instead of on every call.
     
-    # Generate a weekly report
-    await generate_report(ctx, TimeFrame.WEEK)
+    Args:
+        func: Async request helper taking the agent context first
+        
+    Returns:
+        The helper itself, or a stub that logs an error and returns None
+    """
+    if CONTENT_ANALYZER_ADDRESS:
+        return func
+    
+    @wraps(func)
+    async def not_configured(ctx: Context, *args, **kwargs):
+        ctx.logger.error("Content analyzer agent address not configured")
+        return None
     
-    # Wait a bit for the response
-    await asyncio.sleep(2)
+    return not_configured
+
+
+@lru_cache(maxsize=8)
+def _build_report_request(time_frame: TimeFrame) -> GenerateReportRequest:
+    """
+    Build the report request for a time frame once and reuse it.
     
-    # Request insights
-    await get_insights(ctx)
+    Args:
+        time_frame: Time frame for the report
+        
+    Returns:
+        Report request covering all supported platforms, with recommendations
+    """
+    return GenerateReportRequest(
+        time_frame=time_frame,
+        platforms=list(SUPPORTED_PLATFORMS),
+        include_recommendations=True
+    )
 
 
+async def _send(ctx: Context, request, label: str) -> bool:
+    """
+    Send a request to the content analyzer agent, logging any failure.
+    
+    Args:
+        ctx: Agent context
+        request: Request model to send
+        label: What is being requested, for the error message
+        
+    Returns:
+        True if the request was sent
+    """
+    try:
+        await ctx.send(CONTENT_ANALYZER_ADDRESS, request)
+        return True
+    except Exception as e:
+        ctx.logger.error(f"Error requesting {label}: {e}")
+        return False
+
+
+@require_address
 async def request_content(ctx: Context, platforms: list[Platform], limit: int = 10):
     """
     Request content from the content analyzer agent.
@@ -74,55 +303,58 @@ async def request_content(ctx: Context, platforms: list[Platform], limit: int =
         platforms: List of platforms to fetch content from
         limit: Maximum number of content items to fetch per platform
     """
-    if not CONTENT_ANALYZER_ADDRESS:
-        ctx.logger.error("Content analyzer agent address not configured")
+    # Skip the request while the same content is already being fetched
+    request_key = f"content:{','.join(sorted(p.value for p in platforms))}:{limit}"
+    
+    if not _claim_request(request_key):
+        ctx.logger.info("Content request already in flight, skipping")
         return
     
-    # Calculate date range (last 30 days)
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=30)
+    # Get date range (last 30 days) as ISO strings
+    start_date_str, end_date_str = _content_date_range(int(time.time() // 60))
     
-    # Format dates as ISO strings
-    start_date_str = start_date.isoformat()
-    end_date_str = end_date.isoformat()
+    if ctx.logger.isEnabledFor(logging.INFO):
+        ctx.logger.info(f"Requesting content from {', '.join([p.value for p in platforms])}")
     
-    ctx.logger.info(f"Requesting content from {', '.join([p.value for p in platforms])}")
+    # Tag the request with a correlation ID the agent echoes in its response
+    correlation_id = uuid4().hex
+    _content_request_keys[correlation_id] = request_key
     
-    try:
-        # Send request to content analyzer agent
-        await ctx.send(CONTENT_ANALYZER_ADDRESS, FetchContentRequest(
-            platforms=platforms,
-            start_date=start_date_str,
-            end_date=end_date_str,
-            limit=limit
-        ))
-    except Exception as e:
-        ctx.logger.error(f"Error requesting content: {e}")
+    request = FetchContentRequest(
+        platforms=platforms,
+        start_date=start_date_str,
+        end_date=end_date_str,
+        limit=limit,
+        correlation_id=correlation_id
+    )
+    
+    if not await _send(ctx, request, "content"):
+        _content_request_keys.pop(correlation_id, None)
+        _release_requests([request_key])
 
 
-async def request_metrics(ctx: Context, content_ids: list[str]):
+@require_address
+async def request_metrics(ctx: Context, content_ids: Iterable[str]):
     """
     Request metrics from the content analyzer agent.
     
     Args:
         ctx: Agent context
-        content_ids: List of content IDs to fetch metrics for
+        content_ids: Content IDs to fetch metrics for
     """
-    if not CONTENT_ANALYZER_ADDRESS:
-        ctx.logger.error("Content analyzer agent address not configured")
+    # Leave out content whose metrics are already being fetched
+    content_ids = [content_id for content_id in content_ids if _claim_request(f"metrics:{content_id}")]
+    
+    if not content_ids:
         return
     
     ctx.logger.info(f"Requesting metrics for {len(content_ids)} content items")
     
-    try:
-        # Send request to content analyzer agent
-        await ctx.send(CONTENT_ANALYZER_ADDRESS, FetchMetricsRequest(
-            content_ids=content_ids
-        ))
-    except Exception as e:
-        ctx.logger.error(f"Error requesting metrics: {e}")
+    if not await _send(ctx, FetchMetricsRequest(content_ids=content_ids), "metrics"):
+        _release_requests([f"metrics:{content_id}" for content_id in content_ids])
 
 
+@require_address
 async def generate_report(ctx: Context, time_frame: TimeFrame):
     """
     Request a report from the content analyzer agent.
@@ -131,23 +363,20 @@ async def generate_report(ctx: Context, time_frame: TimeFrame):
         ctx: Agent context
         time_frame: Time frame for the report
     """
-    if not CONTENT_ANALYZER_ADDRESS:
-        ctx.logger.error("Content analyzer agent address not configured")
+    # Reuse a recently received report for the same time frame
+    cached_report = _get_cached_response(f"report:{time_frame.value}", REPORT_CACHE_TTL)
+    
+    if cached_report is not None:
+        ctx.logger.info(f"Using cached {time_frame.value} report")
+        log_report(ctx, CONTENT_ANALYZER_ADDRESS, cached_report)
         return
     
     ctx.logger.info(f"Requesting {time_frame.value} report")
     
-    try:
-        # Send request to content analyzer agent
-        await ctx.send(CONTENT_ANALYZER_ADDRESS, GenerateReportRequest(
-            time_frame=time_frame,
-            platforms=[Platform.YOUTUBE, Platform.INSTAGRAM, Platform.TIKTOK],
-            include_recommendations=True
-        ))
-    except Exception as e:
-        ctx.logger.error(f"Error requesting report: {e}")
+    await _send(ctx, _build_report_request(time_frame), "report")
 
 
+@require_address
 async def get_insights(ctx: Context, limit: int = 5):
     """
     Request insights from the content analyzer agent.
@@ -156,19 +385,88 @@ async def get_insights(ctx: Context, limit: int = 5):
         ctx: Agent context
         limit: Maximum number of insights to fetch
     """
-    if not CONTENT_ANALYZER_ADDRESS:
-        ctx.logger.error("Content analyzer agent address not configured")
+    # Reuse recently received insights for the same limit
+    cached_insights = _get_cached_response(f"insights:{limit}", INSIGHTS_CACHE_TTL)
+    
+    if cached_insights is not None:
+        ctx.logger.info("Using cached insights")
+        log_insights(ctx, CONTENT_ANALYZER_ADDRESS, cached_insights)
         return
     
     ctx.logger.info(f"Requesting insights")
     
+    # Tag the request with a correlation ID the agent echoes in its response
+    correlation_id = uuid4().hex
+    _insights_limits[correlation_id] = limit
+    
+    request = GetInsightsRequest(limit=limit, correlation_id=correlation_id)
+    if not await _send(ctx, request, "insights"):
+        _insights_limits.pop(correlation_id, None)
+
+
+@require_address
+async def send_request(ctx: Context, request, timeout: float = RESPONSE_TIMEOUT):
+    """
+    Send a request to the content analyzer agent and wait for its response.
+    
+    Args:
+        ctx: Agent context
+        request: Request model (FetchContentRequest, FetchMetricsRequest,
+            GenerateReportRequest or GetInsightsRequest)
+        timeout: Seconds to wait for the response
+        
+    Returns:
+        The response, or None if it did not arrive in time
+    """
+    # Tag the request with a correlation ID the agent echoes in its response,
+    # and register the future the response handler resolves
+    correlation_id = uuid4().hex
+    future = asyncio.get_running_loop().create_future()
+    _pending_responses[correlation_id] = future
+    
     try:
-        # Send request to content analyzer agent
-        await ctx.send(CONTENT_ANALYZER_ADDRESS, GetInsightsRequest(
-            limit=limit
-        ))
-    except Exception as e:
-        ctx.logger.error(f"Error requesting insights: {e}")
+        if await _send(ctx, request.copy(update={"correlation_id": correlation_id}), type(request).__name__):
+            return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        ctx.logger.error(f"Timed out waiting for a response to {type(request).__name__}")
+    finally:
+        _pending_responses.pop(correlation_id, None)
+    
+    return None
+
+
+async def run_batch_async(ctx: Context, requests: list, timeout: float = RESPONSE_TIMEOUT) -> list:
+    """
+    Send a batch of requests to the content analyzer agent and wait for the responses.
+    
+    Args:
+        ctx: Agent context
+        requests: Request models to send concurrently
+        timeout: Seconds to wait for each response
+        
+    Returns:
+        Responses in request order, None for requests without a response in time
+    """
+    return await asyncio.gather(*[send_request(ctx, request, timeout) for request in requests])
+
+
+def _resolve_response(msg) -> bool:
+    """
+    Hand a response to the send_request caller waiting for it.
+    
+    Args:
+        msg: Response model received from the content analyzer agent
+        
+    Returns:
+        True if a caller was waiting for the response
+    """
+    future = _pending_responses.get(msg.correlation_id) if msg.correlation_id else None
+    
+    if future is None or future.done():
+        return False
+    
+    future.set_result(msg)
+    return True
 
 
 @client_agent.on_message(model=FetchContentResponse)
@@ -176,16 +474,39 @@ async def handle_content_response(ctx: Context, sender: str, msg: FetchContentRe
     """
     Handle content responses from the content analyzer agent.
     """
+    # Responses to send_request calls go back to the waiting caller
+    if _resolve_response(msg):
+        return
+    
     ctx.logger.info(f"Received content response from {sender} with {msg.total_count} items")
     
+    # Release the request this response answers; a response without a correlation
+    # ID (from an agent that does not echo it) completes every pending content request
+    if msg.correlation_id:
+        request_key = _content_request_keys.pop(msg.correlation_id, None)
+        _release_requests([request_key] if request_key else [])
+    else:
+        _release_requests([key for key in _in_flight if key.startswith("content:")])
+    
     if msg.content_items:
         # Log the first few content items
-        for item in msg.content_items[:3]:
+        for item in islice(msg.content_items, 3):
             ctx.logger.info(f"Content item: {item.platform.value} - {item.content_type.value} - {item.title or item.id}")
         
-        # Request metrics for the content items
-        content_ids = [item.id for item in msg.content_items]
-        await request_metrics(ctx, content_ids)
+        # Bucket content IDs by platform so the server can fetch each platform's metrics together
+        content_ids_by_platform = defaultdict(list)
+        for item in msg.content_items:
+            content_ids_by_platform[item.platform].append(item.id)
+        
+        for platform, platform_content_ids in content_ids_by_platform.items():
+            ctx.logger.info(f"Received {len(platform_content_ids)} {platform.value} content items")
+        
+        # Request metrics in concurrent mini-batches so the first metrics arrive
+        # without waiting for the whole set; the handler returns without waiting
+        # for the sends so the next message is not held up
+        content_ids = chain.from_iterable(content_ids_by_platform.values())
+        for batch in _batches(content_ids, METRICS_BATCH_SIZE):
+            _start_background(request_metrics(ctx, batch))
 
 
 @client_agent.on_message(model=FetchMetricsResponse)
@@ -193,11 +514,17 @@ async def handle_metrics_response(ctx: Context, sender: str, msg: FetchMetricsRe
     """
     Handle metrics responses from the content analyzer agent.
     """
+    # Responses to send_request calls go back to the waiting caller
+    if _resolve_response(msg):
+        return
+    
     ctx.logger.info(f"Received metrics response from {sender} with {len(msg.metrics)} items")
     
-    if msg.metrics:
+    _release_requests([f"metrics:{content_id}" for content_id in msg.metrics])
+    
+    if msg.metrics and ctx.logger.isEnabledFor(logging.INFO):
         # Log the first few metrics
-        for content_id, metrics in list(msg.metrics.items())[:3]:
+        for content_id, metrics in islice(msg.metrics.items(), 3):
             ctx.logger.info(f"Metrics for {content_id}: Views: {metrics.views}, Likes: {metrics.likes}, Comments: {metrics.comments}")
 
 
@@ -206,11 +533,30 @@ async def handle_report_response(ctx: Context, sender: str, msg: GenerateReportR
     """
     Handle report responses from the content analyzer agent.
     """
+    # Responses to send_request calls go back to the waiting caller
+    if _resolve_response(msg):
+        return
+    
     if not msg.report:
         ctx.logger.error("Received empty report response")
         return
     
-    report = msg.report
+    _response_cache[f"report:{msg.report.time_frame.value}"] = (time.monotonic(), msg.report)
+    
+    log_report(ctx, sender, msg.report)
+
+
+def log_report(ctx: Context, sender: str, report: PerformanceReport):
+    """
+    Log a summary of a performance report.
+    
+    Args:
+        ctx: Agent context
+        sender: Address of the agent that produced the report
+        report: Performance report to log
+    """
+    if not ctx.logger.isEnabledFor(logging.INFO):
+        return
     
     ctx.logger.info(f"Received {report.time_frame.value} report from {sender}")
     ctx.logger.info(f"Report period: {report.start_date} to {report.end_date}")
@@ -218,13 +564,13 @@ async def handle_report_response(ctx: Context, sender: str, msg: GenerateReportR
     
     # Log insights
     ctx.logger.info(f"Report contains {len(report.insights)} insights:")
-    for i, insight in enumerate(report.insights[:3], 1):
-        ctx.logger.info(f"Insight {i}: {insight.description}")
+    for i, insight in enumerate(islice(report.insights, 3), 1):
+        ctx.logger.info("Insight %d: %s", i, insight.description)
     
     # Log recommendations
     ctx.logger.info(f"Report contains {len(report.recommendations)} recommendations:")
-    for i, recommendation in enumerate(report.recommendations[:3], 1):
-        ctx.logger.info(f"Recommendation {i}: {recommendation}")
+    for i, recommendation in enumerate(islice(report.recommendations, 3), 1):
+        ctx.logger.info("Recommendation %d: %s", i, recommendation)
 
 
 @client_agent.on_message(model=GetInsightsResponse)
@@ -232,10 +578,35 @@ async def handle_insights_response(ctx: Context, sender: str, msg: GetInsightsRe
     """
     Handle insights responses from the content analyzer agent.
     """
-    ctx.logger.info(f"Received insights response from {sender} with {len(msg.insights)} insights")
+    # Responses to send_request calls go back to the waiting caller
+    if _resolve_response(msg):
+        return
+    
+    # Cache the insights under the limit of the request they answer, if it is known
+    limit = _insights_limits.pop(msg.correlation_id, None) if msg.correlation_id else None
+    if limit is not None:
+        _response_cache[f"insights:{limit}"] = (time.monotonic(), msg.insights)
+    
+    log_insights(ctx, sender, msg.insights)
+
+
+def log_insights(ctx: Context, sender: str, insights: list[PerformanceInsight]):
+    """
+    Log performance insights.
+    
+    Args:
+        ctx: Agent context
+        sender: Address of the agent that produced the insights
+        insights: Performance insights to log
+    """
+    if not ctx.logger.isEnabledFor(logging.INFO):
+        return
+    
+    ctx.logger.info(f"Received insights response from {sender} with {len(insights)} insights")
     
-    for i, insight in enumerate(msg.insights, 1):
-        ctx.logger.info(f"Insight {i}: {insight.insight_type} - {insight.description} (Confidence: {insight.confidence:.2f})")
+    for i, insight in enumerate(insights, 1):
+        ctx.logger.info("Insight %d: %s - %s (Confidence: %.2f)",
+                        i, insight.insight_type, insight.description, insight.confidence)
 
 
 if __name__ == "__main__":
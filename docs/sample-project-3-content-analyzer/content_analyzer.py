@@ -1,8 +1,12 @@
 import os
 import json
 import asyncio
+import time
+import calendar
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any, Tuple
+from collections import defaultdict, deque
+from functools import partial
+from typing import List, Dict, Optional, Any, Tuple, Union
 
 from dotenv import load_dotenv
 from uagents import Agent, Context
@@ -27,11 +31,8 @@ from models import (
     GetInsightsResponse
 )
 
-from platform_connectors import (
-    YouTubeConnector,
-    InstagramConnector,
-    TikTokConnector
-)
+import platform_connectors
+from platform_connectors import create_client
 
 from analysis import (
     MetricsAnalyzer,
@@ -39,6 +40,16 @@ from analysis import (
     InsightGenerator
 )
 
+from storage import JSONStore
+
+# Use uvloop's faster event loop when it is installed. The agent takes its loop
+# from the policy when it is created, so this has to run before Agent() below.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # Load environment variables
 load_dotenv()
 
@@ -52,6 +63,35 @@ DEFAULT_PLATFORMS = os.getenv("DEFAULT_PLATFORMS", "YOUTUBE,INSTAGRAM,TIKTOK").s
 DEFAULT_TIME_FRAME = TimeFrame(os.getenv("DEFAULT_TIME_FRAME", "WEEK"))
 DEFAULT_REPORT_SCHEDULE = os.getenv("DEFAULT_REPORT_SCHEDULE", "WEEKLY")
 
+# Default platforms resolved once by member name, skipping unknown names
+DEFAULT_PLATFORM_LIST = tuple(Platform[p] for p in DEFAULT_PLATFORMS if p in Platform.__members__)
+
+# Name of the content analyzer's data store (saved as <name>_data.json)
+STORAGE_NAME = os.getenv("STORAGE_NAME", "content_analyzer")
+
+# Keys of the data kept in the analyzer's store
+STORED_KEYS = ("content_items", "metrics", "audience_data", "insights", "reports")
+
+# Most recent insights and reports kept in storage
+MAX_STORED_INSIGHTS = 100
+MAX_STORED_REPORTS = 10
+
+# Interval between daily report deadlines
+SECONDS_PER_DAY = 86400
+
+# Seconds fetched audience data is reused before the platform is asked again
+AUDIENCE_CACHE_TTL = float(os.getenv("AUDIENCE_CACHE_TTL", "300"))
+
+# Platform names used in log messages
+PLATFORM_LABELS = {
+    Platform.YOUTUBE: "YouTube",
+    Platform.INSTAGRAM: "Instagram",
+    Platform.TIKTOK: "TikTok"
+}
+
+# Platforms whose connectors can fetch metrics in the same calls as content
+STATS_WITH_CONTENT_PLATFORMS = frozenset({Platform.YOUTUBE})
+
 # Create the agent
 content_analyzer = Agent(
     name="content-analyzer",
@@ -69,6 +109,23 @@ content_analyzer_protocol = QuotaProtocol(
 )
 
 
+def _to_storage_dict(model) -> Dict[str, Any]:
+    """
+    Convert a model without nested model fields to a dictionary for storage.
+    
+    dict(model) reads the validated field values directly, skipping the recursive
+    conversion that Model.dict() performs. The result is equal to model.dict(),
+    but list and dict field values are shared with the model instead of copied.
+    
+    Args:
+        model: ContentItem, ContentMetrics, AudienceData or PerformanceInsight object
+        
+    Returns:
+        Dictionary mapping field names to values
+    """
+    return dict(model)
+
+
 class ContentAnalyzerAgent:
     """
     Agent for analyzing content performance across multiple platforms.
@@ -83,23 +140,28 @@ class ContentAnalyzerAgent:
         """
         self.ctx = ctx
         
-        # Initialize platform connectors
+        # HTTP client shared by the Instagram and TikTok connectors, so all their
+        # API calls draw on one keep-alive connection pool
+        self.http_client = create_client()
+        
+        # Initialize platform connectors (each connector's module is imported on first
+        # access, so a missing API client library only disables that platform)
         try:
-            self.youtube_connector = YouTubeConnector()
+            self.youtube_connector = platform_connectors.YouTubeConnector()
             ctx.logger.info("YouTube connector initialized")
         except Exception as e:
             self.youtube_connector = None
             ctx.logger.error(f"Failed to initialize YouTube connector: {e}")
         
         try:
-            self.instagram_connector = InstagramConnector()
+            self.instagram_connector = platform_connectors.InstagramConnector(client=self.http_client)
             ctx.logger.info("Instagram connector initialized")
         except Exception as e:
             self.instagram_connector = None
             ctx.logger.error(f"Failed to initialize Instagram connector: {e}")
         
         try:
-            self.tiktok_connector = TikTokConnector()
+            self.tiktok_connector = platform_connectors.TikTokConnector(client=self.http_client)
             ctx.logger.info("TikTok connector initialized")
         except Exception as e:
             self.tiktok_connector = None
@@ -110,37 +172,90 @@ class ContentAnalyzerAgent:
         self.pattern_analyzer = PatternAnalyzer()
         self.insight_generator = InsightGenerator()
         
-        # Initialize storage
+        # Audience data per platform as (time.monotonic() fetched, AudienceData),
+        # and the fetch tasks still running so concurrent callers can share them
+        self._audience_cache = {}
+        self._audience_in_flight = {}
+        
+        # Report generation tasks still running, keyed by report parameters, so
+        # concurrent requests for the same report share one run
+        self._report_in_flight = {}
+        
+        # Initialize storage (separate from the agent's own storage, which also holds
+        # protocol bookkeeping and is saved as indented JSON on every write)
+        self.storage = JSONStore(STORAGE_NAME)
         self._initialize_storage()
+        
+        # Bounded in-memory copies of the stored insights and reports; appending
+        # drops the oldest entries without re-slicing the whole list
+        self._insights = deque(self.storage.get("insights", []), maxlen=MAX_STORED_INSIGHTS)
+        self._reports = deque(self.storage.get("reports", []), maxlen=MAX_STORED_REPORTS)
+        
+        # Platform of every stored content item, so metrics requests can be grouped
+        # by platform without rebuilding ContentItem objects
+        self._platform_by_id = {
+            content_id: Platform(item_dict["platform"])
+            for content_id, item_dict in self.storage.get("content_items", {}).items()
+        }
     
     def _initialize_storage(self):
         """
         Initialize storage for the agent.
+        
+        Data saved by earlier versions in the agent's own storage is imported
+        once, while this store does not hold any of it yet.
         """
+        if not any(self.storage.has(key) for key in STORED_KEYS):
+            for key in STORED_KEYS:
+                value = self.ctx.storage.get(key)
+                if value:
+                    self.storage.set(key, value)
+                    self.ctx.logger.info(f"Imported stored {key} from the agent's storage")
+        
         # Initialize content items storage
-        if not self.ctx.storage.get("content_items"):
-            self.ctx.storage.set("content_items", {})
+        if not self.storage.get("content_items"):
+            self.storage.set("content_items", {})
         
         # Initialize metrics storage
-        if not self.ctx.storage.get("metrics"):
-            self.ctx.storage.set("metrics", {})
+        if not self.storage.get("metrics"):
+            self.storage.set("metrics", {})
         
         # Initialize audience data storage
-        if not self.ctx.storage.get("audience_data"):
-            self.ctx.storage.set("audience_data", {})
+        if not self.storage.get("audience_data"):
+            self.storage.set("audience_data", {})
         
         # Initialize insights storage
-        if not self.ctx.storage.get("insights"):
-            self.ctx.storage.set("insights", [])
+        if not self.storage.get("insights"):
+            self.storage.set("insights", [])
         
         # Initialize reports storage
-        if not self.ctx.storage.get("reports"):
-            self.ctx.storage.set("reports", [])
+        if not self.storage.get("reports"):
+            self.storage.set("reports", [])
+    
+    def _get_connectors(self, platforms) -> List[Tuple[Platform, Any]]:
+        """
+        Get the initialized connectors for the requested platforms.
+        
+        Args:
+            platforms: Platforms to get connectors for
+            
+        Returns:
+            List of (platform, connector) tuples in YouTube, Instagram, TikTok order
+        """
+        connectors = (
+            (Platform.YOUTUBE, self.youtube_connector),
+            (Platform.INSTAGRAM, self.instagram_connector),
+            (Platform.TIKTOK, self.tiktok_connector)
+        )
+        
+        return [(platform, connector) for platform, connector in connectors
+                if platform in platforms and connector]
     
     async def fetch_content(self, platforms: List[Platform], 
                            start_date: Optional[str] = None, 
                            end_date: Optional[str] = None, 
-                           limit: int = 10) -> List[ContentItem]:
+                           limit: int = 10,
+                           include_stats: bool = False) -> Union[List[ContentItem], Tuple[List[ContentItem], Dict[str, ContentMetrics]]]:
         """
         Fetch content from specified platforms.
         
@@ -149,60 +264,62 @@ class ContentAnalyzerAgent:
             start_date: Start date for content (ISO format)
             end_date: End date for content (ISO format)
             limit: Maximum number of content items to fetch per platform
+            include_stats: Whether to also fetch metrics from the platforms that return
+                them in the same calls as content (see STATS_WITH_CONTENT_PLATFORMS)
             
         Returns:
-            List of ContentItem objects
+            List of ContentItem objects, or a tuple of that list and a dictionary
+            mapping content IDs to the ContentMetrics fetched with them if
+            include_stats is set
         """
-        content_items = []
-        
-        # Fetch content from YouTube
-        if Platform.YOUTUBE in platforms and self.youtube_connector:
+        async def fetch_platform_content(platform: Platform, connector) -> Tuple[List[ContentItem], Dict[str, ContentMetrics]]:
+            label = PLATFORM_LABELS[platform]
             try:
-                youtube_items = await self.youtube_connector.fetch_content(
-                    start_date=start_date,
-                    end_date=end_date,
-                    limit=limit
-                )
-                content_items.extend(youtube_items)
-                self.ctx.logger.info(f"Fetched {len(youtube_items)} items from YouTube")
+                if include_stats and platform in STATS_WITH_CONTENT_PLATFORMS:
+                    items, platform_metrics = await connector.fetch_content(
+                        start_date=start_date,
+                        end_date=end_date,
+                        limit=limit,
+                        include_stats=True
+                    )
+                else:
+                    items = await connector.fetch_content(
+                        start_date=start_date,
+                        end_date=end_date,
+                        limit=limit
+                    )
+                    platform_metrics = {}
+                self.ctx.logger.info(f"Fetched {len(items)} items from {label}")
+                return items, platform_metrics
             except Exception as e:
-                self.ctx.logger.error(f"Error fetching YouTube content: {e}")
+                self.ctx.logger.error(f"Error fetching {label} content: {e}")
+                return [], {}
         
-        # Fetch content from Instagram
-        if Platform.INSTAGRAM in platforms and self.instagram_connector:
-            try:
-                instagram_items = await self.instagram_connector.fetch_content(
-                    start_date=start_date,
-                    end_date=end_date,
-                    limit=limit
-                )
-                content_items.extend(instagram_items)
-                self.ctx.logger.info(f"Fetched {len(instagram_items)} items from Instagram")
-            except Exception as e:
-                self.ctx.logger.error(f"Error fetching Instagram content: {e}")
+        # Fetch content from all platforms concurrently (results keep platform order)
+        results = await asyncio.gather(*[
+            fetch_platform_content(platform, connector)
+            for platform, connector in self._get_connectors(platforms)
+        ])
         
-        # Fetch content from TikTok
-        if Platform.TIKTOK in platforms and self.tiktok_connector:
-            try:
-                tiktok_items = await self.tiktok_connector.fetch_content(
-                    start_date=start_date,
-                    end_date=end_date,
-                    limit=limit
-                )
-                content_items.extend(tiktok_items)
-                self.ctx.logger.info(f"Fetched {len(tiktok_items)} items from TikTok")
-            except Exception as e:
-                self.ctx.logger.error(f"Error fetching TikTok content: {e}")
+        content_items = [item for items, _ in results for item in items]
         
-        # Store content items
-        content_items_dict = self.ctx.storage.get("content_items", {})
+        # Store content items (one merged write, skipped when nothing was fetched)
+        if content_items:
+            content_items_dict = self.storage.get("content_items", {})
+            content_items_dict.update({item.id: _to_storage_dict(item) for item in content_items})
+            self._platform_by_id.update({item.id: item.platform for item in content_items})
+            self.storage.set("content_items", content_items_dict)
         
-        for item in content_items:
-            content_items_dict[item.id] = item.dict()
+        if not include_stats:
+            return content_items
+        
+        metrics = {}
+        for _, platform_metrics in results:
+            metrics.update(platform_metrics)
         
-        self.ctx.storage.set("content_items", content_items_dict)
+        self._store_metrics(metrics)
         
-        return content_items
+        return content_items, metrics
     
     async def fetch_metrics(self, content_ids: List[str], 
                            platforms: Optional[List[Platform]] = None) -> Dict[str, ContentMetrics]:
@@ -216,75 +333,53 @@ class ContentAnalyzerAgent:
         Returns:
             Dictionary mapping content IDs to ContentMetrics objects
         """
-        # Get content items
-        content_items_dict = self.ctx.storage.get("content_items", {})
-        content_items = {}
+        # Group the known content IDs by platform (each ID once, in request order)
+        platform_content_ids = defaultdict(list)
         
-        for content_id in content_ids:
-            if content_id in content_items_dict:
-                item_dict = content_items_dict[content_id]
-                content_items[content_id] = ContentItem(**item_dict)
-        
-        if not content_items:
-            return {}
-        
-        # Group content IDs by platform
-        platform_content_ids = {}
-        
-        for content_id, item in content_items.items():
-            if platforms and item.platform not in platforms:
-                continue
+        for content_id in dict.fromkeys(content_ids):
+            platform = self._platform_by_id.get(content_id)
             
-            if item.platform not in platform_content_ids:
-                platform_content_ids[item.platform] = []
+            if platform is None or (platforms and platform not in platforms):
+                continue
             
-            platform_content_ids[item.platform].append(content_id)
+            platform_content_ids[platform].append(content_id)
         
-        metrics = {}
-        
-        # Fetch metrics from YouTube
-        if Platform.YOUTUBE in platform_content_ids and self.youtube_connector:
+        async def fetch_platform_metrics(platform: Platform, connector) -> Dict[str, ContentMetrics]:
+            label = PLATFORM_LABELS[platform]
             try:
-                youtube_metrics = await self.youtube_connector.fetch_metrics(
-                    platform_content_ids[Platform.YOUTUBE]
-                )
-                metrics.update(youtube_metrics)
-                self.ctx.logger.info(f"Fetched metrics for {len(youtube_metrics)} YouTube items")
+                platform_metrics = await connector.fetch_metrics(platform_content_ids[platform])
+                self.ctx.logger.info(f"Fetched metrics for {len(platform_metrics)} {label} items")
+                return platform_metrics
             except Exception as e:
-                self.ctx.logger.error(f"Error fetching YouTube metrics: {e}")
+                self.ctx.logger.error(f"Error fetching {label} metrics: {e}")
+                return {}
         
-        # Fetch metrics from Instagram
-        if Platform.INSTAGRAM in platform_content_ids and self.instagram_connector:
-            try:
-                instagram_metrics = await self.instagram_connector.fetch_metrics(
-                    platform_content_ids[Platform.INSTAGRAM]
-                )
-                metrics.update(instagram_metrics)
-                self.ctx.logger.info(f"Fetched metrics for {len(instagram_metrics)} Instagram items")
-            except Exception as e:
-                self.ctx.logger.error(f"Error fetching Instagram metrics: {e}")
+        # Fetch metrics from all platforms concurrently
+        results = await asyncio.gather(*[
+            fetch_platform_metrics(platform, connector)
+            for platform, connector in self._get_connectors(platform_content_ids)
+        ])
         
-        # Fetch metrics from TikTok
-        if Platform.TIKTOK in platform_content_ids and self.tiktok_connector:
-            try:
-                tiktok_metrics = await self.tiktok_connector.fetch_metrics(
-                    platform_content_ids[Platform.TIKTOK]
-                )
-                metrics.update(tiktok_metrics)
-                self.ctx.logger.info(f"Fetched metrics for {len(tiktok_metrics)} TikTok items")
-            except Exception as e:
-                self.ctx.logger.error(f"Error fetching TikTok metrics: {e}")
-        
-        # Store metrics
-        metrics_dict = self.ctx.storage.get("metrics", {})
-        
-        for content_id, metric in metrics.items():
-            metrics_dict[content_id] = metric.dict()
+        metrics = {}
+        for platform_metrics in results:
+            metrics.update(platform_metrics)
         
-        self.ctx.storage.set("metrics", metrics_dict)
+        self._store_metrics(metrics)
         
         return metrics
     
+    def _store_metrics(self, metrics: Dict[str, ContentMetrics]):
+        """
+        Store fetched metrics (one merged write, skipped when nothing was fetched).
+        
+        Args:
+            metrics: Dictionary mapping content IDs to ContentMetrics objects
+        """
+        if metrics:
+            metrics_dict = self.storage.get("metrics", {})
+            metrics_dict.update({content_id: _to_storage_dict(metric) for content_id, metric in metrics.items()})
+            self.storage.set("metrics", metrics_dict)
+    
     async def fetch_audience_data(self, platforms: List[Platform]) -> Dict[Platform, AudienceData]:
         """
         Fetch audience data from specified platforms.
@@ -295,53 +390,70 @@ class ContentAnalyzerAgent:
         Returns:
             Dictionary mapping platforms to AudienceData objects
         """
-        audience_data = {}
-        
-        # Fetch audience data from YouTube
-        if Platform.YOUTUBE in platforms and self.youtube_connector:
-            try:
-                youtube_audience = await self.youtube_connector.fetch_audience_data()
-                if youtube_audience:
-                    audience_data[Platform.YOUTUBE] = youtube_audience
-                    self.ctx.logger.info("Fetched YouTube audience data")
-            except Exception as e:
-                self.ctx.logger.error(f"Error fetching YouTube audience data: {e}")
-        
-        # Fetch audience data from Instagram
-        if Platform.INSTAGRAM in platforms and self.instagram_connector:
+        async def fetch_platform_audience(platform: Platform, connector) -> Optional[AudienceData]:
+            label = PLATFORM_LABELS[platform]
             try:
-                instagram_audience = await self.instagram_connector.fetch_audience_data()
-                if instagram_audience:
-                    audience_data[Platform.INSTAGRAM] = instagram_audience
-                    self.ctx.logger.info("Fetched Instagram audience data")
+                platform_audience = await connector.fetch_audience_data()
+                if platform_audience:
+                    self.ctx.logger.info(f"Fetched {label} audience data")
+                    self._audience_cache[platform] = (time.monotonic(), platform_audience)
+                return platform_audience
             except Exception as e:
-                self.ctx.logger.error(f"Error fetching Instagram audience data: {e}")
-        
-        # Fetch audience data from TikTok
-        if Platform.TIKTOK in platforms and self.tiktok_connector:
-            try:
-                tiktok_audience = await self.tiktok_connector.fetch_audience_data()
-                if tiktok_audience:
-                    audience_data[Platform.TIKTOK] = tiktok_audience
-                    self.ctx.logger.info("Fetched TikTok audience data")
-            except Exception as e:
-                self.ctx.logger.error(f"Error fetching TikTok audience data: {e}")
-        
-        # Store audience data
-        audience_data_dict = self.ctx.storage.get("audience_data", {})
+                self.ctx.logger.error(f"Error fetching {label} audience data: {e}")
+                return None
+            finally:
+                self._audience_in_flight.pop(platform, None)
+        
+        async def get_platform_audience(platform: Platform, connector) -> Optional[AudienceData]:
+            # Reuse audience data fetched within the TTL
+            entry = self._audience_cache.get(platform)
+            if entry and time.monotonic() - entry[0] < AUDIENCE_CACHE_TTL:
+                return entry[1]
+            
+            # Join a fetch that is already running instead of starting another one
+            task = self._audience_in_flight.get(platform)
+            if task is None:
+                task = asyncio.create_task(fetch_platform_audience(platform, connector))
+                self._audience_in_flight[platform] = task
+            
+            # Shield the shared task so one cancelled caller does not cancel it for the others
+            return await asyncio.shield(task)
+        
+        # Fetch audience data from all platforms concurrently
+        connectors = self._get_connectors(platforms)
+        results = await asyncio.gather(*[
+            get_platform_audience(platform, connector) for platform, connector in connectors
+        ])
+        
+        audience_data = {
+            platform: platform_audience
+            for (platform, _), platform_audience in zip(connectors, results)
+            if platform_audience
+        }
         
-        for platform, data in audience_data.items():
-            audience_data_dict[platform.value] = data.dict()
+        # Store audience data (one merged write, skipped when everything was already
+        # stored, e.g. served from the cache; the fetch timestamp tells fetches apart)
+        audience_data_dict = self.storage.get("audience_data", {})
+        new_audience_data = {
+            platform.value: _to_storage_dict(data)
+            for platform, data in audience_data.items()
+            if audience_data_dict.get(platform.value, {}).get("timestamp") != data.timestamp
+        }
         
-        self.ctx.storage.set("audience_data", audience_data_dict)
+        if new_audience_data:
+            audience_data_dict.update(new_audience_data)
+            self.storage.set("audience_data", audience_data_dict)
         
         return audience_data
     
-    def analyze_content(self, content_items: List[ContentItem], 
-                       metrics: Dict[str, ContentMetrics]) -> Tuple[List[PerformanceInsight], List[str]]:
+    async def analyze_content(self, content_items: List[ContentItem], 
+                             metrics: Dict[str, ContentMetrics]) -> Tuple[List[PerformanceInsight], List[str]]:
         """
         Analyze content performance and generate insights and recommendations.
         
+        The analyses are independent of each other, so they run concurrently in the
+        default executor instead of blocking the event loop one after another.
+        
         Args:
             content_items: List of ContentItem objects
             metrics: Dictionary mapping content IDs to ContentMetrics objects
@@ -354,43 +466,31 @@ class ContentAnalyzerAgent:
         
         insights = []
         
-        # Convert metrics dictionary to list
-        metrics_list = list(metrics.values())
-        
-        # Calculate average metrics
-        avg_metrics = self.metrics_analyzer.calculate_average_metrics(metrics_list)
-        
-        # Calculate platform metrics
-        platform_metrics = self.metrics_analyzer.calculate_platform_metrics(metrics_list)
-        
-        # Identify top performing content
-        top_content_ids = self.metrics_analyzer.identify_top_performing_content(
-            content_items, metrics, "engagement_rate", 5
-        )
-        
-        # Calculate posting frequency
-        posting_frequency = self.metrics_analyzer.calculate_posting_frequency(content_items)
-        
-        # Calculate best posting times
-        best_posting_times = self.metrics_analyzer.calculate_best_posting_times(content_items, metrics)
-        
-        # Identify content type performance
-        content_type_performance = self.pattern_analyzer.identify_content_type_performance(content_items, metrics)
-        
-        # Identify platform performance
-        platform_performance = self.pattern_analyzer.identify_platform_performance(content_items, metrics)
-        
-        # Identify popular topics
-        popular_topics = self.pattern_analyzer.identify_popular_topics(content_items, metrics)
-        
-        # Identify popular hashtags
-        popular_hashtags = self.pattern_analyzer.identify_popular_hashtags(content_items, metrics)
-        
-        # Identify content length performance
-        content_length_performance = self.pattern_analyzer.identify_content_length_performance(content_items, metrics)
-        
-        # Identify seasonal patterns
-        seasonal_patterns = self.pattern_analyzer.identify_seasonal_patterns(content_items, metrics)
+        # Engagement rates are read by every pattern analysis, so they are mapped once
+        rates = {"rates_by_id": self.pattern_analyzer.engagement_rates(metrics)}
+        
+        # Run the analyses in worker threads
+        loop = asyncio.get_running_loop()
+        (
+            content_type_performance,
+            platform_performance,
+            popular_topics,
+            popular_hashtags,
+            content_length_performance,
+            best_posting_times,
+            seasonal_patterns
+        ) = await asyncio.gather(*[
+            loop.run_in_executor(None, partial(analysis, content_items, metrics, **kwargs))
+            for analysis, kwargs in (
+                (self.pattern_analyzer.identify_content_type_performance, rates),
+                (self.pattern_analyzer.identify_platform_performance, rates),
+                (self.pattern_analyzer.identify_popular_topics, rates),
+                (self.pattern_analyzer.identify_popular_hashtags, rates),
+                (self.pattern_analyzer.identify_content_length_performance, rates),
+                (self.metrics_analyzer.calculate_best_posting_times, {}),
+                (self.pattern_analyzer.identify_seasonal_patterns, rates)
+            )
+        ])
         
         # Generate insights
         if content_type_performance:
@@ -414,27 +514,82 @@ class ContentAnalyzerAgent:
         if seasonal_patterns:
             insights.extend(self.insight_generator.generate_seasonal_insights(seasonal_patterns))
         
-        # Store insights
-        insights_dict = self.ctx.storage.get("insights", [])
-        insights_dict.extend([insight.dict() for insight in insights])
-        
-        # Keep only the last 100 insights to avoid excessive storage
-        if len(insights_dict) > 100:
-            insights_dict = insights_dict[-100:]
-        
-        self.ctx.storage.set("insights", insights_dict)
+        # Store insights (only the last MAX_STORED_INSIGHTS are kept)
+        self._insights.extend(map(_to_storage_dict, insights))
+        self.storage.set("insights", list(self._insights))
         
         # Generate recommendations
         recommendations = self.insight_generator.generate_recommendations(insights)
         
         return insights, recommendations
     
+    def summarize_metrics(self, content_items: List[ContentItem], 
+                          metrics: Dict[str, ContentMetrics]) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Summarize metrics for a performance report.
+        
+        Args:
+            content_items: List of ContentItem objects
+            metrics: Dictionary mapping content IDs to ContentMetrics objects
+            
+        Returns:
+            Tuple of (top_content_ids, metrics_summary)
+        """
+        # Convert the metrics to a DataFrame once, shared by every summary below
+        frame = self.metrics_analyzer.to_frame(metrics)
+        
+        # Identify top performing content
+        top_content_ids = self.metrics_analyzer.identify_top_performing_content_df(
+            content_items, frame, "engagement_rate", 5
+        )
+        
+        # Calculate average metrics
+        avg_metrics = self.metrics_analyzer.calculate_average_metrics_df(frame)
+        
+        # Calculate platform metrics
+        platform_metrics = self.metrics_analyzer.calculate_platform_metrics_df(frame)
+        
+        # Create metrics summary
+        metrics_summary = {
+            "average_metrics": avg_metrics,
+            "platform_metrics": {p.value: m for p, m in platform_metrics.items()},
+            **self.metrics_analyzer.calculate_total_metrics_df(frame)
+        }
+        
+        return top_content_ids, metrics_summary
+    
     async def generate_report(self, time_frame: TimeFrame, 
                              platforms: Optional[List[Platform]] = None,
                              include_recommendations: bool = True) -> Optional[PerformanceReport]:
         """
         Generate a performance report for a time period.
         
+        Args:
+            time_frame: Time frame for the report
+            platforms: Optional list of platforms to include in the report
+            include_recommendations: Whether to include recommendations in the report
+            
+        Returns:
+            PerformanceReport object or None if report generation fails
+        """
+        key = (time_frame, frozenset(platforms or DEFAULT_PLATFORM_LIST), include_recommendations)
+        
+        # Join a run for the same report that is already in progress
+        task = self._report_in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate_report(time_frame, platforms, include_recommendations))
+            self._report_in_flight[key] = task
+            task.add_done_callback(lambda _: self._report_in_flight.pop(key, None))
+        
+        # Shield the shared task so one cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
+    
+    async def _generate_report(self, time_frame: TimeFrame, 
+                               platforms: Optional[List[Platform]],
+                               include_recommendations: bool) -> Optional[PerformanceReport]:
+        """
+        Generate a performance report for a time period, without sharing the run.
+        
         Args:
             time_frame: Time frame for the report
             platforms: Optional list of platforms to include in the report
@@ -465,55 +620,37 @@ class ContentAnalyzerAgent:
         
         # Use default platforms if not specified
         if not platforms:
-            platforms = [Platform(p) for p in DEFAULT_PLATFORMS if hasattr(Platform, p)]
+            platforms = list(DEFAULT_PLATFORM_LIST)
         
-        # Fetch content for the time period
-        content_items = await self.fetch_content(
+        # Fetch content for the time period, with the metrics of platforms that
+        # return them in the same calls
+        content_items, metrics = await self.fetch_content(
             platforms=platforms,
             start_date=start_date_str,
             end_date=end_date_str,
-            limit=100
+            limit=100,
+            include_stats=True
         )
         
         if not content_items:
             self.ctx.logger.error("No content items found for the specified time period")
             return None
         
-        # Fetch metrics for the content items
-        content_ids = [item.id for item in content_items]
-        metrics = await self.fetch_metrics(content_ids, platforms)
+        # Fetch metrics for the other content items
+        content_ids = [item.id for item in content_items if item.id not in metrics]
+        if content_ids:
+            metrics.update(await self.fetch_metrics(content_ids, platforms))
         
         if not metrics:
             self.ctx.logger.error("No metrics found for the content items")
             return None
         
-        # Analyze content and generate insights and recommendations
-        insights, recommendations = self.analyze_content(content_items, metrics)
-        
-        # Identify top performing content
-        top_content_ids = self.metrics_analyzer.identify_top_performing_content(
-            content_items, metrics, "engagement_rate", 5
+        # Analyze content and summarize metrics concurrently, each computed once
+        (insights, recommendations), (top_content_ids, metrics_summary) = await asyncio.gather(
+            self.analyze_content(content_items, metrics),
+            asyncio.get_running_loop().run_in_executor(None, self.summarize_metrics, content_items, metrics)
         )
         
-        # Convert metrics dictionary to list
-        metrics_list = list(metrics.values())
-        
-        # Calculate average metrics
-        avg_metrics = self.metrics_analyzer.calculate_average_metrics(metrics_list)
-        
-        # Calculate platform metrics
-        platform_metrics = self.metrics_analyzer.calculate_platform_metrics(metrics_list)
-        
-        # Create metrics summary
-        metrics_summary = {
-            "average_metrics": avg_metrics,
-            "platform_metrics": {p.value: m for p, m in platform_metrics.items()},
-            "total_views": sum(m.views or 0 for m in metrics_list),
-            "total_likes": sum(m.likes or 0 for m in metrics_list),
-            "total_comments": sum(m.comments or 0 for m in metrics_list),
-            "total_shares": sum(m.shares or 0 for m in metrics_list)
-        }
-        
         # Create the report
         report = PerformanceReport.create(
             time_frame=time_frame,
@@ -527,17 +664,25 @@ class ContentAnalyzerAgent:
             recommendations=recommendations if include_recommendations else []
         )
         
-        # Store the report
-        reports = self.ctx.storage.get("reports", [])
-        reports.append(report.dict())
-        
-        # Keep only the last 10 reports to avoid excessive storage
-        if len(reports) > 10:
-            reports = reports[-10:]
-        
-        self.ctx.storage.set("reports", reports)
+        # Store the report (only the last MAX_STORED_REPORTS are kept)
+        self._reports.append({**dict(report), "insights": [_to_storage_dict(insight) for insight in report.insights]})
+        self.storage.set("reports", list(self._reports))
         
         return report
+    
+    async def close(self):
+        """
+        Close the platform connectors' HTTP connections.
+        """
+        for _, connector in self._get_connectors(list(Platform)):
+            await connector.close()
+        
+        await self.http_client.aclose()
+
+
+# The agent instance, created on startup. It holds live connectors and caches,
+# so it is kept in the module rather than in the agent's (serialized) storage.
+agent_instance: Optional[ContentAnalyzerAgent] = None
 
 
 @content_analyzer.on_event("startup")
@@ -547,11 +692,10 @@ async def startup(ctx: Context):
     """
     ctx.logger.info(f"Content Analyzer Agent started with address: {content_analyzer.address}")
     
-    # Create the agent instance
-    agent = ContentAnalyzerAgent(ctx)
+    global agent_instance
     
-    # Store the agent instance
-    ctx.storage.set("agent_instance", agent)
+    # Create and store the agent instance
+    agent_instance = ContentAnalyzerAgent(ctx)
     
     # Schedule the first report generation
     if DEFAULT_REPORT_SCHEDULE == "DAILY":
@@ -565,57 +709,79 @@ async def startup(ctx: Context):
         asyncio.create_task(schedule_monthly_report(ctx))
 
 
+@content_analyzer.on_event("shutdown")
+async def shutdown(ctx: Context):
+    """
+    Release the content analyzer agent's connections on shutdown.
+    """
+    # Get the agent instance
+    agent = agent_instance
+    
+    if agent:
+        await agent.close()
+
+
 async def schedule_daily_report(ctx: Context):
     """
     Schedule daily report generation.
     """
+    # Wait until the next day at 00:00
+    now = datetime.utcnow()
+    tomorrow = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    deadline = time.monotonic() + (tomorrow - now).total_seconds()
+    
     while True:
-        # Wait until the next day at 00:00
-        now = datetime.utcnow()
-        tomorrow = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-        wait_seconds = (tomorrow - now).total_seconds()
-        
-        await asyncio.sleep(wait_seconds)
+        await asyncio.sleep(max(0, deadline - time.monotonic()))
         
         # Generate the report
         await generate_scheduled_report(ctx, TimeFrame.DAY)
+        
+        # Advance the absolute deadline so late wake-ups and slow reports do not drift
+        deadline += SECONDS_PER_DAY
 
 
 async def schedule_weekly_report(ctx: Context):
     """
     Schedule weekly report generation.
     """
+    # Wait until the next Monday at 00:00 (a week from today on Mondays)
+    now = datetime.utcnow()
+    days_until_monday = (7 - now.weekday()) % 7 or 7
+    next_monday = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=days_until_monday)
+    deadline = time.monotonic() + (next_monday - now).total_seconds()
+    
     while True:
-        # Wait until the next Monday at 00:00
-        now = datetime.utcnow()
-        days_until_monday = (7 - now.weekday()) % 7
-        next_monday = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=days_until_monday)
-        wait_seconds = (next_monday - now).total_seconds()
-        
-        await asyncio.sleep(wait_seconds)
+        await asyncio.sleep(max(0, deadline - time.monotonic()))
         
         # Generate the report
         await generate_scheduled_report(ctx, TimeFrame.WEEK)
+        
+        # Advance the absolute deadline so late wake-ups and slow reports do not drift
+        deadline += 7 * SECONDS_PER_DAY
 
 
 async def schedule_monthly_report(ctx: Context):
     """
     Schedule monthly report generation.
     """
+    # Wait until the first day of the next month at 00:00
+    now = datetime.utcnow()
+    if now.month == 12:
+        next_month = now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    else:
+        next_month = now.replace(month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    
+    deadline = time.monotonic() + (next_month - now).total_seconds()
+    
     while True:
-        # Wait until the first day of the next month at 00:00
-        now = datetime.utcnow()
-        if now.month == 12:
-            next_month = now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-        else:
-            next_month = now.replace(month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        wait_seconds = (next_month - now).total_seconds()
-        
-        await asyncio.sleep(wait_seconds)
+        await asyncio.sleep(max(0, deadline - time.monotonic()))
         
         # Generate the report
         await generate_scheduled_report(ctx, TimeFrame.MONTH)
+        
+        # Advance the absolute deadline by the length of the month that just started
+        deadline += calendar.monthrange(next_month.year, next_month.month)[1] * SECONDS_PER_DAY
+        next_month = (next_month + timedelta(days=32)).replace(day=1)
 
 
 async def generate_scheduled_report(ctx: Context, time_frame: TimeFrame):
@@ -629,7 +795,7 @@ async def generate_scheduled_report(ctx: Context, time_frame: TimeFrame):
     ctx.logger.info(f"Generating scheduled {time_frame.value} report")
     
     # Get the agent instance
-    agent = ctx.storage.get("agent_instance")
+    agent = agent_instance
     
     if not agent:
         ctx.logger.error("Agent instance not found")
@@ -638,7 +804,7 @@ async def generate_scheduled_report(ctx: Context, time_frame: TimeFrame):
     # Generate the report
     report = await agent.generate_report(
         time_frame=time_frame,
-        platforms=[Platform(p) for p in DEFAULT_PLATFORMS if hasattr(Platform, p)],
+        platforms=list(DEFAULT_PLATFORM_LIST),
         include_recommendations=True
     )
     
@@ -656,11 +822,11 @@ async def handle_fetch_content(ctx: Context, sender: str, msg: FetchContentReque
     ctx.logger.info(f"Received request to fetch content from {sender}")
     
     # Get the agent instance
-    agent = ctx.storage.get("agent_instance")
+    agent = agent_instance
     
     if not agent:
         ctx.logger.error("Agent instance not found")
-        await ctx.send(sender, FetchContentResponse(content_items=[], total_count=0))
+        await ctx.send(sender, FetchContentResponse(content_items=[], total_count=0, correlation_id=msg.correlation_id))
         return
     
     # Fetch content
@@ -674,7 +840,8 @@ async def handle_fetch_content(ctx: Context, sender: str, msg: FetchContentReque
     # Send response
     await ctx.send(sender, FetchContentResponse(
         content_items=content_items,
-        total_count=len(content_items)
+        total_count=len(content_items),
+        correlation_id=msg.correlation_id
     ))
 
 
@@ -686,11 +853,11 @@ async def handle_fetch_metrics(ctx: Context, sender: str, msg: FetchMetricsReque
     ctx.logger.info(f"Received request to fetch metrics from {sender}")
     
     # Get the agent instance
-    agent = ctx.storage.get("agent_instance")
+    agent = agent_instance
     
     if not agent:
         ctx.logger.error("Agent instance not found")
-        await ctx.send(sender, FetchMetricsResponse(metrics={}))
+        await ctx.send(sender, FetchMetricsResponse(metrics={}, correlation_id=msg.correlation_id))
         return
     
     # Fetch metrics
@@ -700,7 +867,7 @@ async def handle_fetch_metrics(ctx: Context, sender: str, msg: FetchMetricsReque
     )
     
     # Send response
-    await ctx.send(sender, FetchMetricsResponse(metrics=metrics))
+    await ctx.send(sender, FetchMetricsResponse(metrics=metrics, correlation_id=msg.correlation_id))
 
 
 @content_analyzer_protocol.on_message(model=GenerateReportRequest, replies={GenerateReportResponse})
@@ -711,11 +878,11 @@ async def handle_generate_report(ctx: Context, sender: str, msg: GenerateReportR
     ctx.logger.info(f"Received request to generate a report from {sender}")
     
     # Get the agent instance
-    agent = ctx.storage.get("agent_instance")
+    agent = agent_instance
     
     if not agent:
         ctx.logger.error("Agent instance not found")
-        await ctx.send(sender, GenerateReportResponse(report=None))
+        await ctx.send(sender, GenerateReportResponse(report=None, correlation_id=msg.correlation_id))
         return
     
     # Generate the report
@@ -726,7 +893,7 @@ async def handle_generate_report(ctx: Context, sender: str, msg: GenerateReportR
     )
     
     # Send response
-    await ctx.send(sender, GenerateReportResponse(report=report))
+    await ctx.send(sender, GenerateReportResponse(report=report, correlation_id=msg.correlation_id))
 
 
 @content_analyzer_protocol.on_message(model=GetInsightsRequest, replies={GetInsightsResponse})
@@ -737,23 +904,22 @@ async def handle_get_insights(ctx: Context, sender: str, msg: GetInsightsRequest
     ctx.logger.info(f"Received request to get insights from {sender}")
     
     # Get insights from storage
-    insights_dict = ctx.storage.get("insights", [])
-    
-    # Convert dictionaries to PerformanceInsight objects
-    insights = [PerformanceInsight(**insight) for insight in insights_dict]
+    agent = agent_instance
+    insights_dict = agent.storage.get("insights", []) if agent else []
     
-    # Filter insights if requested
+    # Filter the stored dictionaries if requested (Platform is a str enum, so it
+    # compares equal to a platform stored as either a member or its value)
     if msg.content_id:
-        insights = [insight for insight in insights if insight.content_id == msg.content_id]
+        insights_dict = [insight for insight in insights_dict if insight.get("content_id") == msg.content_id]
     
     if msg.platform:
-        insights = [insight for insight in insights if insight.platform == msg.platform]
+        insights_dict = [insight for insight in insights_dict if insight.get("platform") == msg.platform]
     
-    # Limit the number of insights
-    insights = insights[:msg.limit]
+    # Limit the number of insights, then convert only those to PerformanceInsight objects
+    insights = [PerformanceInsight(**insight) for insight in insights_dict[:msg.limit]]
     
     # Send response
-    await ctx.send(sender, GetInsightsResponse(insights=insights))
+    await ctx.send(sender, GetInsightsResponse(insights=insights, correlation_id=msg.correlation_id))
 
 
 # Include the protocol in the agent
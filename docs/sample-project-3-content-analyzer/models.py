@@ -75,14 +75,31 @@ class ContentMetrics(Model):
     additional_metrics: Optional[Dict[str, Any]] = None
     
     @classmethod
-    def create(cls, content_id: str, platform: Platform, **metrics):
+    def create(cls, content_id: str, platform: Platform, timestamp: Optional[str] = None, **metrics):
         """
         Factory method to create ContentMetrics with the current timestamp.
+        
+        A batch of metrics can share one timestamp by passing it in.
         """
         return cls(
             content_id=content_id,
             platform=platform,
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=timestamp or datetime.utcnow().isoformat(),
+            **metrics
+        )
+    
+    @classmethod
+    def create_unchecked(cls, content_id: str, platform: Platform, timestamp: Optional[str] = None, **metrics):
+        """
+        Like create, but skips validation.
+        
+        For metrics built by the platform connectors, whose values already have
+        the declared types, so validating them again would only cost time.
+        """
+        return cls.construct(
+            content_id=content_id,
+            platform=platform,
+            timestamp=timestamp or datetime.utcnow().isoformat(),
             **metrics
         )
 
@@ -100,13 +117,15 @@ class AudienceData(Model):
     device_distribution: Optional[Dict[str, float]] = None  # Device type -> percentage
     
     @classmethod
-    def create(cls, platform: Platform, **data):
+    def create(cls, platform: Platform, timestamp: Optional[str] = None, **data):
         """
         Factory method to create AudienceData with the current timestamp.
+        
+        A batch of audience data can share one timestamp by passing it in.
         """
         return cls(
             platform=platform,
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=timestamp or datetime.utcnow().isoformat(),
             **data
         )
 
@@ -124,15 +143,18 @@ class PerformanceInsight(Model):
     timestamp: str
     
     @classmethod
-    def create(cls, insight_type: str, description: str, confidence: float, **kwargs):
+    def create(cls, insight_type: str, description: str, confidence: float,
+               timestamp: Optional[str] = None, **kwargs):
         """
         Factory method to create a PerformanceInsight with the current timestamp.
+        
+        A batch of insights can share one timestamp by passing it in.
         """
         return cls(
             insight_type=insight_type,
             description=description,
             confidence=confidence,
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=timestamp or datetime.utcnow().isoformat(),
             **kwargs
         )
 
@@ -184,6 +206,7 @@ class FetchContentRequest(Model):
     start_date: Optional[str] = None
     end_date: Optional[str] = None
     limit: int = 10
+    correlation_id: Optional[str] = None  # Echoed back in the response
 
 
 class FetchContentResponse(Model):
@@ -192,6 +215,7 @@ class FetchContentResponse(Model):
     """
     content_items: List[ContentItem]
     total_count: int
+    correlation_id: Optional[str] = None  # Copied from the request
 
 
 class FetchMetricsRequest(Model):
@@ -200,6 +224,7 @@ class FetchMetricsRequest(Model):
     """
     content_ids: List[str]
     platforms: Optional[List[Platform]] = None
+    correlation_id: Optional[str] = None  # Echoed back in the response
 
 
 class FetchMetricsResponse(Model):
@@ -207,6 +232,7 @@ class FetchMetricsResponse(Model):
     Response model for fetching metrics for content items.
     """
     metrics: Dict[str, ContentMetrics]  # Content ID -> Metrics
+    correlation_id: Optional[str] = None  # Copied from the request
 
 
 class GenerateReportRequest(Model):
@@ -216,6 +242,7 @@ class GenerateReportRequest(Model):
     time_frame: TimeFrame
     platforms: Optional[List[Platform]] = None
     include_recommendations: bool = True
+    correlation_id: Optional[str] = None  # Echoed back in the response
 
 
 class GenerateReportResponse(Model):
@@ -223,6 +250,7 @@ class GenerateReportResponse(Model):
     Response model for generating a performance report.
     """
     report: PerformanceReport
+    correlation_id: Optional[str] = None  # Copied from the request
 
 
 class GetInsightsRequest(Model):
@@ -232,6 +260,7 @@ class GetInsightsRequest(Model):
     content_id: Optional[str] = None
     platform: Optional[Platform] = None
     limit: int = 5
+    correlation_id: Optional[str] = None  # Echoed back in the response
 
 
 class GetInsightsResponse(Model):
@@ -239,3 +268,4 @@ class GetInsightsResponse(Model):
     Response model for getting insights.
     """
     insights: List[PerformanceInsight]
+    correlation_id: Optional[str] = None  # Copied from the request
@@ -1,6 +1,28 @@
 # This file makes the platform_connectors directory a Python package
-from .youtube import YouTubeConnector
-from .instagram import InstagramConnector
-from .tiktok import TikTokConnector
+import importlib
 
-__all__ = ['YouTubeConnector', 'InstagramConnector', 'TikTokConnector']
+from .sessions import create_client
+
+# Connector classes and the modules they live in; a connector's module (and its
+# API client library) is only imported when the connector is first used
+_CONNECTOR_MODULES = {
+    'YouTubeConnector': 'youtube',
+    'InstagramConnector': 'instagram',
+    'TikTokConnector': 'tiktok'
+}
+
+__all__ = ['YouTubeConnector', 'InstagramConnector', 'TikTokConnector', 'create_client']
+
+
+def __getattr__(name):
+    if name in _CONNECTOR_MODULES:
+        module = importlib.import_module(f".{_CONNECTOR_MODULES[name]}", __name__)
+        connector = getattr(module, name)
+        globals()[name] = connector
+        return connector
+    
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_CONNECTOR_MODULES))
@@ -0,0 +1,96 @@
+import asyncio
+from typing import List, Optional
+
+import httpx
+
+from .throttle import AdaptiveThrottle, THROTTLE_STATUSES, MAX_RETRIES, backoff_delay
+from .hashtags import extract_hashtags
+from .sessions import create_client
+
+
+class BaseConnector:
+    """
+    Shared plumbing for connectors that call a platform's HTTP API directly.
+    
+    Handles the HTTP client and its lifetime, throttled requests, hashtag
+    extraction and the engagement rate calculation, so platform connectors
+    only implement the API calls themselves.
+    """
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the connector's HTTP client and throttle.
+        
+        Args:
+            client: HTTP client to send requests through, shared with other
+                connectors (a client owned by the connector is created if omitted)
+        """
+        # One HTTP client for all API calls, so they reuse pooled keep-alive connections
+        self._owns_client = client is None
+        self.client = create_client() if client is None else client
+        
+        # Client-side rate limiting for this platform's API quota
+        self.throttle = AdaptiveThrottle()
+    
+    async def close(self):
+        """
+        Close the HTTP client and its pooled connections, unless it was passed in.
+        """
+        if self._owns_client:
+            await self.client.aclose()
+    
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a GET request through the client, admitted by the throttle.
+        
+        Throttling responses (429 or 5xx) are retried up to MAX_RETRIES times
+        with exponential backoff, on top of any Retry-After pause.
+        
+        Args:
+            url: URL to request
+            **kwargs: Additional arguments for httpx.AsyncClient.get
+            
+        Returns:
+            The response, which is the last throttling response if every retry failed
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            async with self.throttle:
+                response = await self.client.get(url, **kwargs)
+                self.throttle.record(response.status_code, response.headers)
+            
+            if response.status_code not in THROTTLE_STATUSES or attempt == MAX_RETRIES:
+                return response
+            
+            # Wait outside the throttle so the slot is free meanwhile; the throttle
+            # also holds the retry back for as long as Retry-After asks
+            await asyncio.sleep(backoff_delay(attempt))
+    
+    def _extract_hashtags(self, text: str) -> List[str]:
+        """
+        Extract hashtags from a caption or description.
+        
+        Args:
+            text: Caption or description text
+            
+        Returns:
+            List of hashtags
+        """
+        return extract_hashtags(text)
+    
+    def _calculate_engagement_rate(self, engagement: int, reach: int) -> float:
+        """
+        Calculate the engagement rate of a content item.
+        
+        Engagement rate = engagement / reach * 100
+        
+        Args:
+            engagement: Total engagement count
+            reach: Views or impressions the engagement is measured against
+            
+        Returns:
+            Engagement rate as a percentage
+        """
+        if reach == 0:
+            return 0.0
+        
+        return engagement / reach * 100
@@ -0,0 +1,22 @@
+import re
+from typing import List
+
+
+# A "#" that starts a whitespace-separated word, capturing the rest of the word
+HASHTAG_PATTERN = re.compile(r"(?<!\S)#(\S*)")
+
+
+def extract_hashtags(text: str) -> List[str]:
+    """
+    Extract hashtags from a caption or description in one regex pass.
+    
+    Every whitespace-separated word starting with "#" is a hashtag, returned
+    without its leading "#".
+    
+    Args:
+        text: Text to extract hashtags from
+    
+    Returns:
+        List of hashtags
+    """
+    return HASHTAG_PATTERN.findall(text) if text else []
@@ -1,12 +1,37 @@
 import os
-import requests
+import asyncio
+import httpx
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 
 from models import ContentItem, ContentMetrics, AudienceData, Platform, ContentType
+from .timestamps import to_unix_timestamp
+from .base import BaseConnector
+from .sessions import decode_json
 
 
-class InstagramConnector:
+# Fields requested for each post when listing media
+MEDIA_FIELDS = "id,caption,media_type,media_url,permalink,timestamp,thumbnail_url"
+
+# Insight metrics requested for each post, in the order the API returns them
+INSIGHT_METRICS = ("engagement", "impressions", "reach", "saved")
+
+# Fields requested for a post's metrics, with its insights as a nested field
+METRICS_FIELDS = f"comments_count,like_count,insights.metric({','.join(INSIGHT_METRICS)})"
+
+# Fields requested for the account's audience data
+AUDIENCE_FIELDS = "followers_count,media_count"
+
+# Content type for each lowercased media type; carousel albums are treated as
+# images for simplicity, as are unknown media types
+MEDIA_CONTENT_TYPES = {
+    "image": ContentType.IMAGE,
+    "video": ContentType.VIDEO,
+    "carousel_album": ContentType.IMAGE
+}
+
+
+class InstagramConnector(BaseConnector):
     """
     Connector for the Instagram API to fetch content and metrics.
     
@@ -15,13 +40,16 @@ class InstagramConnector:
     token refreshing, and more comprehensive error handling.
     """
     
-    def __init__(self, access_token: Optional[str] = None, user_id: Optional[str] = None):
+    def __init__(self, access_token: Optional[str] = None, user_id: Optional[str] = None,
+                 client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the Instagram connector.
         
         Args:
             access_token: Instagram access token (defaults to environment variable)
             user_id: Instagram user ID (defaults to environment variable)
+            client: HTTP client to send requests through, shared with other
+                connectors (a client owned by the connector is created if omitted)
         """
         self.access_token = access_token or os.getenv("INSTAGRAM_ACCESS_TOKEN")
         self.user_id = user_id or os.getenv("INSTAGRAM_USER_ID")
@@ -32,7 +60,14 @@ class InstagramConnector:
         if not self.user_id:
             raise ValueError("Instagram user ID not provided")
         
+        super().__init__(client)
+        
         self.api_base_url = "https://graph.instagram.com/v18.0"
+        
+        # Query parameters that are the same for every call, built once
+        self._auth_params = {"access_token": self.access_token}
+        self._metrics_params = {**self._auth_params, "fields": METRICS_FIELDS}
+        self._audience_params = {**self._auth_params, "fields": AUDIENCE_FIELDS}
     
     async def fetch_content(self, start_date: Optional[str] = None, 
                            end_date: Optional[str] = None, 
@@ -49,72 +84,57 @@ class InstagramConnector:
             List of ContentItem objects
         """
         try:
-            # Convert dates to datetime objects if provided
-            start_datetime = datetime.fromisoformat(start_date) if start_date else None
-            end_datetime = datetime.fromisoformat(end_date) if end_date else None
-            
             # Get media for the user
             url = f"{self.api_base_url}/{self.user_id}/media"
-            params = {
-                "access_token": self.access_token,
-                "fields": "id,caption,media_type,media_url,permalink,timestamp,thumbnail_url",
-                "limit": limit
-            }
+            params = {**self._auth_params, "fields": MEDIA_FIELDS, "limit": limit}
+            
+            # Let the API filter by date, so only posts in range are returned
+            if start_date:
+                params["since"] = to_unix_timestamp(start_date)
+            if end_date:
+                params["until"] = to_unix_timestamp(end_date)
             
-            response = requests.get(url, params=params)
+            response = await self._get(url, params=params)
             response.raise_for_status()
             
-            data = response.json()
+            data = decode_json(response)
             
             if "data" not in data:
                 return []
             
             content_items = []
             
-            for item in data["data"]:
+            # Enum members used for every post, looked up once
+            platform = Platform.INSTAGRAM
+            default_content_type = ContentType.IMAGE
+            
+            # The API already filtered by date, so every post up to the limit is kept
+            for item in data["data"][:limit]:
                 media_id = item["id"]
                 published_at = item["timestamp"]
-                published_datetime = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                
-                # Filter by date if provided
-                if start_datetime and published_datetime < start_datetime:
-                    continue
-                if end_datetime and published_datetime > end_datetime:
-                    continue
+                caption = item.get("caption", "")
                 
                 # Determine content type
-                media_type = item["media_type"].lower()
-                if media_type == "image":
-                    content_type = ContentType.IMAGE
-                elif media_type == "video":
-                    content_type = ContentType.VIDEO
-                elif media_type == "carousel_album":
-                    # For simplicity, we'll treat carousel albums as images
-                    content_type = ContentType.IMAGE
-                else:
-                    content_type = ContentType.IMAGE
+                content_type = MEDIA_CONTENT_TYPES.get(item["media_type"].lower(), default_content_type)
                 
-                # Create ContentItem
-                content_item = ContentItem(
+                # Create ContentItem, skipping validation since the API fields already have
+                # the declared types
+                content_item = ContentItem.construct(
                     id=media_id,
-                    platform=Platform.INSTAGRAM,
+                    platform=platform,
                     content_type=content_type,
                     title=None,  # Instagram posts don't have titles
-                    description=item.get("caption", ""),
+                    description=caption,
                     url=item["permalink"],
                     published_at=published_at,
-                    tags=self._extract_hashtags(item.get("caption", ""))
+                    tags=self._extract_hashtags(caption) if caption else []
                 )
                 
                 content_items.append(content_item)
-                
-                # Stop if we've reached the limit
-                if len(content_items) >= limit:
-                    break
             
             return content_items
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Instagram API error: {e}")
             return []
         except Exception as e:
@@ -131,58 +151,56 @@ class InstagramConnector:
         Returns:
             Dictionary mapping media IDs to ContentMetrics objects
         """
+        # Metrics fetched together share one timestamp
+        timestamp = datetime.utcnow().isoformat()
+        
+        async def fetch_media_metrics(media_id: str) -> Optional[ContentMetrics]:
+            # Get comments, likes and media insights in one request, with the
+            # insights requested as a nested field
+            url = f"{self.api_base_url}/{media_id}"
+            
+            response = await self._get(url, params=self._metrics_params)
+            response.raise_for_status()
+            
+            media_data = decode_json(response)
+            
+            if "data" not in media_data.get("insights", {}):
+                return None
+            
+            # Extract metrics, which come back in the requested order; fall back to
+            # looking them up by name if the API left any out or reordered them
+            insights_data = media_data["insights"]["data"]
+            if tuple(item["name"] for item in insights_data) == INSIGHT_METRICS:
+                engagement, impressions, _, saved = [item["values"][0]["value"] for item in insights_data]
+            else:
+                insights = {item["name"]: item["values"][0]["value"] for item in insights_data}
+                engagement, impressions, saved = (insights.get(name, 0) for name in ("engagement", "impressions", "saved"))
+            
+            # Create ContentMetrics
+            return ContentMetrics.create_unchecked(
+                content_id=media_id,
+                platform=Platform.INSTAGRAM,
+                timestamp=timestamp,
+                views=impressions,
+                likes=media_data.get("like_count", 0),
+                comments=media_data.get("comments_count", 0),
+                saves=saved,
+                engagement_rate=self._calculate_engagement_rate(engagement, impressions)
+            )
+        
         try:
-            metrics = {}
+            # Fetch metrics for all posts concurrently (the throttle caps how many run at once)
+            results = await asyncio.gather(*[fetch_media_metrics(media_id) for media_id in content_ids])
             
-            # Fetch metrics for each post
-            for media_id in content_ids:
-                # Get media insights
-                url = f"{self.api_base_url}/{media_id}/insights"
-                params = {
-                    "access_token": self.access_token,
-                    "metric": "engagement,impressions,reach,saved"
-                }
-                
-                response = requests.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if "data" not in data:
-                    continue
-                
-                # Extract metrics
-                insights = {item["name"]: item["values"][0]["value"] for item in data["data"]}
-                
-                # Get comments and likes
-                url = f"{self.api_base_url}/{media_id}"
-                params = {
-                    "access_token": self.access_token,
-                    "fields": "comments_count,like_count"
-                }
-                
-                response = requests.get(url, params=params)
-                response.raise_for_status()
-                
-                media_data = response.json()
-                
-                # Create ContentMetrics
-                metrics[media_id] = ContentMetrics.create(
-                    content_id=media_id,
-                    platform=Platform.INSTAGRAM,
-                    views=insights.get("impressions", 0),
-                    likes=media_data.get("like_count", 0),
-                    comments=media_data.get("comments_count", 0),
-                    saves=insights.get("saved", 0),
-                    engagement_rate=self._calculate_engagement_rate(
-                        insights.get("engagement", 0),
-                        insights.get("impressions", 0)
-                    )
-                )
+            metrics = {
+                media_id: media_metrics
+                for media_id, media_metrics in zip(content_ids, results)
+                if media_metrics is not None
+            }
             
             return metrics
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Instagram API error: {e}")
             return {}
         except Exception as e:
@@ -199,15 +217,11 @@ class InstagramConnector:
         try:
             # Get user account info
             url = f"{self.api_base_url}/{self.user_id}"
-            params = {
-                "access_token": self.access_token,
-                "fields": "followers_count,media_count"
-            }
             
-            response = requests.get(url, params=params)
+            response = await self._get(url, params=self._audience_params)
             response.raise_for_status()
             
-            data = response.json()
+            data = decode_json(response)
             
             # Create AudienceData
             audience_data = AudienceData.create(
@@ -217,46 +231,9 @@ class InstagramConnector:
             
             return audience_data
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Instagram API error: {e}")
             return None
         except Exception as e:
             print(f"Error fetching Instagram audience data: {e}")
             return None
-    
-    def _extract_hashtags(self, caption: str) -> List[str]:
-        """
-        Extract hashtags from an Instagram caption.
-        
-        Args:
-            caption: Instagram post caption
-            
-        Returns:
-            List of hashtags
-        """
-        if not caption:
-            return []
-        
-        # Split by spaces and filter for hashtags
-        words = caption.split()
-        hashtags = [word[1:] for word in words if word.startswith("#")]
-        
-        return hashtags
-    
-    def _calculate_engagement_rate(self, engagement: int, impressions: int) -> float:
-        """
-        Calculate engagement rate for an Instagram post.
-        
-        Engagement rate = engagement / impressions * 100
-        
-        Args:
-            engagement: Total engagement count
-            impressions: Total impression count
-            
-        Returns:
-            Engagement rate as a percentage
-        """
-        if impressions == 0:
-            return 0.0
-        
-        return engagement / impressions * 100
@@ -0,0 +1,59 @@
+from typing import Any
+
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Keep-alive connections kept open across API hosts
+HTTP_POOL_SIZE = 20
+
+# Seconds to wait on an API call before giving up
+HTTP_TIMEOUT = 10.0
+
+
+def create_client(pool_size: int = HTTP_POOL_SIZE) -> httpx.AsyncClient:
+    """
+    Create an async HTTP client with a keep-alive connection pool.
+    
+    Requests sent through the client reuse open connections (and their TLS
+    sessions) to the same host instead of connecting again for every call.
+    With HTTP/2 available, concurrent requests to a host are multiplexed over
+    a single connection.
+    
+    Args:
+        pool_size: Keep-alive connections kept open
+    
+    Returns:
+        The configured client
+    """
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=pool_size)
+    )
+
+
+def decode_json(response: httpx.Response) -> Any:
+    """
+    Decode a JSON response body, with orjson when it is installed.
+    
+    Args:
+        response: Response to decode
+    
+    Returns:
+        The decoded JSON value
+    """
+    if orjson:
+        return orjson.loads(response.content)
+    
+    return response.json()
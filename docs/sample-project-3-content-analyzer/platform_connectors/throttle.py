@@ -0,0 +1,150 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+# Status codes that mean the provider is overloaded or rate limiting us
+THROTTLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Seconds to pause after a throttling response without a usable Retry-After header
+DEFAULT_RETRY_AFTER = 1.0
+
+# Fraction of the provider's rate limit window left at which requests pause until it resets
+LOW_REMAINING_FRACTION = 0.1
+
+# Times a call that got a throttling response is retried before the response is returned
+MAX_RETRIES = 4
+
+# Seconds waited before the first retry, doubling with each later one up to MAX_BACKOFF
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+    
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+    
+    Returns:
+        Seconds to wait, or None if the value is missing or cannot be parsed
+    """
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Get the exponential backoff before retrying a throttled call.
+    
+    Args:
+        attempt: Number of the attempt that failed, starting from 0
+    
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    return min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt)
+
+
+class AdaptiveThrottle:
+    """
+    Client-side admission control for one platform's API calls.
+    
+    The number of concurrent calls follows AIMD: every successful response raises
+    the limit additively, and every throttling response (429 or 5xx) halves it.
+    Calls also pause when the provider asks for it through Retry-After, or when
+    its X-RateLimit headers show that little of the current window is left.
+    """
+    
+    def __init__(self, min_limit: float = 1.0, max_limit: float = 8.0, increase: float = 0.5):
+        """
+        Initialize the throttle.
+        
+        Args:
+            min_limit: Lowest concurrency limit
+            max_limit: Highest concurrency limit, also the starting limit
+            increase: Amount the limit grows by after each successful response
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        
+        self.limit = max_limit
+        self._active = 0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+    
+    async def __aenter__(self):
+        """
+        Wait for a pause to end and for a free slot under the concurrency limit.
+        """
+        while True:
+            while (delay := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._active < int(self.limit))
+                
+                # A call that finished while this one waited for a slot may have started a pause
+                if self._paused_until <= time.monotonic():
+                    self._active += 1
+                    return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """
+        Release the slot held by the call.
+        """
+        async with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+    
+    def record(self, status: int, headers: Mapping[str, str]):
+        """
+        Adjust the concurrency limit and pause from an API response.
+        
+        Args:
+            status: HTTP status code of the response
+            headers: Response headers, looked up by lowercase name
+        """
+        if status in THROTTLE_STATUSES:
+            self.limit = max(self.min_limit, self.limit / 2)
+            retry_after = _parse_retry_after(headers.get("retry-after"))
+            self._pause(DEFAULT_RETRY_AFTER if retry_after is None else retry_after)
+            return
+        
+        self.limit = min(self.max_limit, self.limit + self.increase)
+        
+        # Pause proactively when the provider's window is nearly used up
+        try:
+            remaining = float(headers["x-ratelimit-remaining"])
+            window = float(headers["x-ratelimit-limit"])
+        except (KeyError, TypeError, ValueError):
+            return
+        
+        if window > 0 and remaining <= window * LOW_REMAINING_FRACTION:
+            reset = _parse_retry_after(headers.get("x-ratelimit-reset"))
+            # Reset values beyond a day are epoch timestamps rather than delays
+            if reset is not None and reset > 86400:
+                reset = max(0.0, reset - time.time())
+            self._pause(DEFAULT_RETRY_AFTER if reset is None else reset)
+    
+    def _pause(self, seconds: float):
+        """
+        Hold back new calls for a number of seconds.
+        
+        Args:
+            seconds: Seconds from now until calls may start again
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
@@ -1,12 +1,31 @@
 import os
-import requests
+import asyncio
+import httpx
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 
 from models import ContentItem, ContentMetrics, AudienceData, Platform, ContentType
+from .timestamps import utc_sort_key
+from .base import BaseConnector
+from .sessions import decode_json
 
 
-class TikTokConnector:
+# Most video IDs a single video query accepts
+MAX_IDS_PER_REQUEST = 20
+
+# Fields requested for each video when listing videos
+VIDEO_FIELDS = "id,create_time,share_url,title,video_description,duration,height,width,cover_image_url,share_count,comment_count,like_count,view_count"
+
+# Fields requested for a video's metrics
+METRICS_FIELDS = "id,share_count,comment_count,like_count,view_count"
+
+# Query parameters for the account's user info
+AUDIENCE_PARAMS = {
+    "fields": "open_id,union_id,avatar_url,avatar_url_100,avatar_large_url,display_name,bio_description,profile_deep_link,is_verified,follower_count,following_count,likes_count,video_count"
+}
+
+
+class TikTokConnector(BaseConnector):
     """
     Connector for the TikTok API to fetch content and metrics.
     
@@ -15,13 +34,16 @@ class TikTokConnector:
     token refreshing, and more comprehensive error handling.
     """
     
-    def __init__(self, access_token: Optional[str] = None, open_id: Optional[str] = None):
+    def __init__(self, access_token: Optional[str] = None, open_id: Optional[str] = None,
+                 client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the TikTok connector.
         
         Args:
             access_token: TikTok access token (defaults to environment variable)
             open_id: TikTok open ID (defaults to environment variable)
+            client: HTTP client to send requests through, shared with other
+                connectors (a client owned by the connector is created if omitted)
         """
         self.access_token = access_token or os.getenv("TIKTOK_ACCESS_TOKEN")
         self.open_id = open_id or os.getenv("TIKTOK_OPEN_ID")
@@ -32,7 +54,12 @@ class TikTokConnector:
         if not self.open_id:
             raise ValueError("TikTok open ID not provided")
         
+        super().__init__(client)
+        
         self.api_base_url = "https://open.tiktokapis.com/v2"
+        
+        # Auth headers are the same for every call, so they are built once
+        self._headers = {"Authorization": f"Bearer {self.access_token}"}
     
     async def fetch_content(self, start_date: Optional[str] = None, 
                            end_date: Optional[str] = None, 
@@ -49,51 +76,53 @@ class TikTokConnector:
             List of ContentItem objects
         """
         try:
-            # Convert dates to datetime objects if provided
-            start_datetime = datetime.fromisoformat(start_date) if start_date else None
-            end_datetime = datetime.fromisoformat(end_date) if end_date else None
+            # Convert dates to string keys once, so posts are filtered by plain string
+            # comparison instead of parsing every post's timestamp
+            start_key = utc_sort_key(start_date) if start_date else None
+            end_key = utc_sort_key(end_date) if end_date else None
             
             # Get videos for the user
             url = f"{self.api_base_url}/video/list/"
-            headers = {
-                "Authorization": f"Bearer {self.access_token}"
-            }
-            params = {
-                "fields": "id,create_time,share_url,title,video_description,duration,height,width,cover_image_url,share_count,comment_count,like_count,view_count",
-                "max_count": limit
-            }
+            params = {"fields": VIDEO_FIELDS, "max_count": limit}
             
-            response = requests.get(url, headers=headers, params=params)
+            response = await self._get(url, headers=self._headers, params=params)
             response.raise_for_status()
             
-            data = response.json()
+            data = decode_json(response)
             
             if "data" not in data or "videos" not in data["data"]:
                 return []
             
             content_items = []
             
+            # Enum members used for every video, looked up once
+            platform = Platform.TIKTOK
+            content_type = ContentType.VIDEO
+            
             for video in data["data"]["videos"]:
                 video_id = video["id"]
                 published_at = video["create_time"]
-                published_datetime = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+                published_key = utc_sort_key(published_at)
                 
                 # Filter by date if provided
-                if start_datetime and published_datetime < start_datetime:
+                if start_key and published_key < start_key:
                     continue
-                if end_datetime and published_datetime > end_datetime:
+                if end_key and published_key > end_key:
                     continue
                 
-                # Create ContentItem
-                content_item = ContentItem(
+                description = video.get("video_description", "")
+                
+                # Create ContentItem, skipping validation since the API fields already have
+                # the declared types
+                content_item = ContentItem.construct(
                     id=video_id,
-                    platform=Platform.TIKTOK,
-                    content_type=ContentType.VIDEO,
+                    platform=platform,
+                    content_type=content_type,
                     title=video.get("title", ""),
-                    description=video.get("video_description", ""),
+                    description=description,
                     url=video["share_url"],
                     published_at=published_at,
-                    tags=self._extract_hashtags(video.get("video_description", ""))
+                    tags=self._extract_hashtags(description) if description else []
                 )
                 
                 content_items.append(content_item)
@@ -104,7 +133,7 @@ class TikTokConnector:
             
             return content_items
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"TikTok API error: {e}")
             return []
         except Exception as e:
@@ -121,45 +150,56 @@ class TikTokConnector:
         Returns:
             Dictionary mapping video IDs to ContentMetrics objects
         """
-        try:
-            metrics = {}
+        # Metrics fetched together share one timestamp
+        timestamp = datetime.utcnow().isoformat()
+        
+        async def fetch_batch_metrics(batch: List[str]) -> Dict[str, ContentMetrics]:
+            # Get video data
+            url = f"{self.api_base_url}/video/query/"
+            params = {"fields": METRICS_FIELDS, "video_ids": batch}
             
-            # Fetch metrics for each video
-            for video_id in content_ids:
-                # Get video data
-                url = f"{self.api_base_url}/video/query/"
-                headers = {
-                    "Authorization": f"Bearer {self.access_token}"
-                }
-                params = {
-                    "fields": "id,share_count,comment_count,like_count,view_count",
-                    "video_ids": [video_id]
-                }
-                
-                response = requests.get(url, headers=headers, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if "data" not in data or "videos" not in data["data"] or not data["data"]["videos"]:
-                    continue
-                
-                video = data["data"]["videos"][0]
-                
-                # Create ContentMetrics
-                metrics[video_id] = ContentMetrics.create(
+            response = await self._get(url, headers=self._headers, params=params)
+            response.raise_for_status()
+            
+            data = decode_json(response)
+            
+            if "data" not in data or "videos" not in data["data"] or not data["data"]["videos"]:
+                return {}
+            
+            videos_by_id = {video["id"]: video for video in data["data"]["videos"]}
+            platform = Platform.TIKTOK
+            
+            # Keep the requested order, skipping videos the API did not return
+            return {
+                video_id: ContentMetrics.create_unchecked(
                     content_id=video_id,
-                    platform=Platform.TIKTOK,
+                    platform=platform,
+                    timestamp=timestamp,
                     views=video.get("view_count", 0),
                     likes=video.get("like_count", 0),
                     comments=video.get("comment_count", 0),
                     shares=video.get("share_count", 0),
-                    engagement_rate=self._calculate_engagement_rate(video)
+                    engagement_rate=self._calculate_video_engagement_rate(video)
                 )
+                for video_id in batch
+                if (video := videos_by_id.get(video_id)) is not None
+            }
+        
+        try:
+            # Fetch metrics for up to MAX_IDS_PER_REQUEST videos per request, with the
+            # requests running concurrently (the throttle caps how many run at once)
+            results = await asyncio.gather(*[
+                fetch_batch_metrics(content_ids[start:start + MAX_IDS_PER_REQUEST])
+                for start in range(0, len(content_ids), MAX_IDS_PER_REQUEST)
+            ])
+            
+            metrics = {}
+            for batch_metrics in results:
+                metrics.update(batch_metrics)
             
             return metrics
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"TikTok API error: {e}")
             return {}
         except Exception as e:
@@ -176,17 +216,11 @@ class TikTokConnector:
         try:
             # Get user info
             url = f"{self.api_base_url}/user/info/"
-            headers = {
-                "Authorization": f"Bearer {self.access_token}"
-            }
-            params = {
-                "fields": "open_id,union_id,avatar_url,avatar_url_100,avatar_large_url,display_name,bio_description,profile_deep_link,is_verified,follower_count,following_count,likes_count,video_count"
-            }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = await self._get(url, headers=self._headers, params=AUDIENCE_PARAMS)
             response.raise_for_status()
             
-            data = response.json()
+            data = decode_json(response)
             
             if "data" not in data or "user" not in data["data"]:
                 return None
@@ -201,33 +235,14 @@ class TikTokConnector:
             
             return audience_data
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"TikTok API error: {e}")
             return None
         except Exception as e:
             print(f"Error fetching TikTok audience data: {e}")
             return None
     
-    def _extract_hashtags(self, description: str) -> List[str]:
-        """
-        Extract hashtags from a TikTok video description.
-        
-        Args:
-            description: TikTok video description
-            
-        Returns:
-            List of hashtags
-        """
-        if not description:
-            return []
-        
-        # Split by spaces and filter for hashtags
-        words = description.split()
-        hashtags = [word[1:] for word in words if word.startswith("#")]
-        
-        return hashtags
-    
-    def _calculate_engagement_rate(self, video: Dict[str, Any]) -> float:
+    def _calculate_video_engagement_rate(self, video: Dict[str, Any]) -> float:
         """
         Calculate engagement rate for a TikTok video.
         
@@ -239,12 +254,6 @@ class TikTokConnector:
         Returns:
             Engagement rate as a percentage
         """
-        views = video.get("view_count", 0)
-        likes = video.get("like_count", 0)
-        comments = video.get("comment_count", 0)
-        shares = video.get("share_count", 0)
-        
-        if views == 0:
-            return 0.0
+        engagement = video.get("like_count", 0) + video.get("comment_count", 0) + video.get("share_count", 0)
         
-        return (likes + comments + shares) / views * 100
+        return self._calculate_engagement_rate(engagement, video.get("view_count", 0))
@@ -0,0 +1,70 @@
+import sys
+from datetime import datetime, timezone
+
+
+# Offsets that mark a timestamp as already being in UTC
+UTC_SUFFIXES = ("Z", "+00:00", "+0000")
+
+
+def _parse_iso_legacy(timestamp: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp on Python versions without "Z" support.
+    
+    Args:
+        timestamp: ISO 8601 timestamp string
+    
+    Returns:
+        Parsed datetime
+    """
+    if timestamp.endswith("Z"):
+        timestamp = timestamp[:-1] + "+00:00"
+    
+    return datetime.fromisoformat(timestamp)
+
+
+# Python 3.11+ parses a trailing "Z" natively, so no string rewrite is needed
+parse_iso_timestamp = datetime.fromisoformat if sys.version_info >= (3, 11) else _parse_iso_legacy
+
+
+def utc_sort_key(timestamp: str) -> str:
+    """
+    Get a key that orders ISO 8601 timestamps chronologically by string comparison.
+    
+    The key is the naive UTC date and time. UTC timestamps are sliced without
+    being parsed; timestamps with another offset are converted, and naive
+    timestamps are taken to be UTC.
+    
+    Args:
+        timestamp: ISO 8601 timestamp string
+    
+    Returns:
+        Sort key for the timestamp
+    """
+    for suffix in UTC_SUFFIXES:
+        if timestamp.endswith(suffix):
+            return timestamp[:-len(suffix)]
+    
+    parsed = parse_iso_timestamp(timestamp)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    return parsed.isoformat()
+
+
+def to_unix_timestamp(timestamp: str) -> int:
+    """
+    Convert an ISO 8601 timestamp to Unix seconds.
+    
+    Naive timestamps are taken to be UTC, as in utc_sort_key.
+    
+    Args:
+        timestamp: ISO 8601 timestamp string
+    
+    Returns:
+        Whole seconds since the Unix epoch
+    """
+    parsed = parse_iso_timestamp(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    
+    return int(parsed.timestamp())
@@ -1,10 +1,72 @@
 import os
-from typing import List, Dict, Optional, Any
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, AsyncIterator, Tuple, Union
 from datetime import datetime, timedelta
 import googleapiclient.discovery
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from googleapiclient.model import JsonModel
+from httplib2 import HttpLib2Error
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from models import ContentItem, ContentMetrics, AudienceData, Platform, ContentType
+from .timestamps import utc_sort_key
+from .throttle import AdaptiveThrottle, THROTTLE_STATUSES, MAX_RETRIES, backoff_delay
+
+
+# Error reasons in 403 responses that mean a short-term rate limit was hit; an
+# exhausted daily quota (quotaExceeded) is not among them, since retrying cannot help
+RATE_LIMIT_REASONS = (b"rateLimitExceeded", b"userRateLimitExceeded")
+
+# Most video IDs a single videos.list request accepts
+MAX_IDS_PER_REQUEST = 50
+
+# Partial-response selectors, so each call returns only the fields that are read
+UPLOADS_PLAYLIST_FIELDS = "items(contentDetails/relatedPlaylists/uploads)"
+PLAYLIST_ITEM_FIELDS = "nextPageToken,items(contentDetails/videoId,snippet/publishedAt)"
+VIDEO_DETAIL_FIELDS = "items(id,snippet(title,description,tags))"
+VIDEO_STATISTICS_FIELDS = "items(id,statistics(viewCount,likeCount,commentCount))"
+VIDEO_DETAIL_STATISTICS_FIELDS = "items(id,snippet(title,description,tags),statistics(viewCount,likeCount,commentCount))"
+CHANNEL_STATISTICS_FIELDS = "items(statistics/subscriberCount)"
+
+# Seconds fetched video details (title, description, tags) are reused before refetching
+VIDEO_CACHE_TTL = float(os.getenv("YOUTUBE_VIDEO_CACHE_TTL", "86400"))
+
+# Most videos whose details are cached; the least recently used are evicted first
+VIDEO_CACHE_SIZE = 1024
+
+
+class OrjsonModel(JsonModel):
+    """
+    JSON model for the YouTube API client that decodes responses with orjson.
+    """
+    
+    def deserialize(self, content):
+        """
+        Decode a response body.
+        
+        Args:
+            content: Response body, as bytes or str
+            
+        Returns:
+            The decoded body, or whatever JsonModel makes of content orjson rejects
+        """
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        
+        return body
 
 
 class YouTubeConnector:
@@ -29,101 +91,271 @@ class YouTubeConnector:
         if not self.channel_id:
             raise ValueError("YouTube channel ID not provided")
         
-        # Initialize the YouTube API client
+        # Initialize the YouTube API client from the discovery document bundled with
+        # the library, skipping the on-disk discovery cache lookup, and decoding
+        # responses with orjson when it is installed
         self.youtube = googleapiclient.discovery.build(
-            "youtube", "v3", developerKey=self.api_key
+            "youtube", "v3", developerKey=self.api_key,
+            static_discovery=True, cache_discovery=False,
+            model=OrjsonModel() if orjson else None
         )
+        
+        # Client-side rate limiting for this platform's API quota
+        self.throttle = AdaptiveThrottle()
+        
+        # Looked up from the channel on the first content fetch
+        self._uploads_playlist_id = None
+        
+        # Video details by video ID, as (time.monotonic() fetch time, video) pairs
+        self._video_cache = OrderedDict()
+        
+        # httplib2 connections are not thread-safe, so each worker thread that
+        # executes requests gets its own, kept for reuse across its requests
+        self._thread_local = threading.local()
+        self._thread_https = []
+        self._thread_https_lock = threading.Lock()
     
-    async def fetch_content(self, start_date: Optional[str] = None, 
-                           end_date: Optional[str] = None, 
-                           limit: int = 10) -> List[ContentItem]:
+    async def close(self):
         """
-        Fetch YouTube videos for the configured channel.
+        Close the YouTube API client's HTTP connections.
+        """
+        self.youtube.close()
+        
+        with self._thread_https_lock:
+            for http in self._thread_https:
+                http.close()
+            self._thread_https.clear()
+    
+    def _execute_in_thread(self, request) -> Dict[str, Any]:
+        """
+        Execute a YouTube API request over the calling thread's own connection.
         
         Args:
-            start_date: Start date for content (ISO format)
-            end_date: End date for content (ISO format)
-            limit: Maximum number of videos to fetch
+            request: Request built from the YouTube API client
             
         Returns:
-            List of ContentItem objects
+            The response body
         """
-        try:
-            # Convert dates to datetime objects if provided
-            start_datetime = datetime.fromisoformat(start_date) if start_date else None
-            end_datetime = datetime.fromisoformat(end_date) if end_date else None
+        http = getattr(self._thread_local, "http", None)
+        if http is None:
+            http = self._thread_local.http = build_http()
+            with self._thread_https_lock:
+                self._thread_https.append(http)
+        
+        return request.execute(http=http)
+    
+    async def _execute(self, request) -> Dict[str, Any]:
+        """
+        Execute a YouTube API request, admitted by the throttle.
+        
+        Throttling errors (429, a 403 rate limit or 5xx) are retried up to
+        MAX_RETRIES times with exponential backoff, on top of any Retry-After pause.
+        
+        Args:
+            request: Request built from the YouTube API client
+            
+        Returns:
+            The response body
+            
+        Raises:
+            HttpError: If the request failed with any other error, or every retry failed
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            async with self.throttle:
+                try:
+                    # Run the blocking request in a worker thread so concurrent calls overlap
+                    response = await asyncio.to_thread(self._execute_in_thread, request)
+                except HttpError as e:
+                    # YouTube reports rate limiting as 403 rather than 429
+                    status = e.resp.status
+                    if status == 403 and any(reason in (e.content or b"") for reason in RATE_LIMIT_REASONS):
+                        status = 429
+                    
+                    self.throttle.record(status, e.resp)
+                    if status not in THROTTLE_STATUSES or attempt == MAX_RETRIES:
+                        raise
+                else:
+                    self.throttle.record(200, {})
+                    return response
             
-            # Get uploads playlist ID for the channel
-            channels_response = self.youtube.channels().list(
+            # Wait outside the throttle so the slot is free meanwhile; the throttle
+            # also holds the retry back for as long as Retry-After asks
+            await asyncio.sleep(backoff_delay(attempt))
+    
+    async def _get_uploads_playlist_id(self) -> str:
+        """
+        Get the ID of the channel's uploads playlist, looked up once and cached.
+        
+        The uploads playlist of a channel never changes, so only the first
+        fetch pays for the channels.list call.
+        
+        Returns:
+            The uploads playlist ID
+        """
+        if self._uploads_playlist_id is None:
+            channels_response = await self._execute(self.youtube.channels().list(
                 part="contentDetails",
-                id=self.channel_id
-            ).execute()
+                id=self.channel_id,
+                fields=UPLOADS_PLAYLIST_FIELDS
+            ))
             
-            if not channels_response["items"]:
+            if not channels_response.get("items"):
                 raise ValueError(f"Channel not found: {self.channel_id}")
             
-            uploads_playlist_id = channels_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+            self._uploads_playlist_id = channels_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+        
+        return self._uploads_playlist_id
+    
+    async def _iter_playlist_items(self, playlist_id: str, page_size: int) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over a playlist's items, fetching each page only when it is reached.
+        
+        Args:
+            playlist_id: ID of the playlist
+            page_size: Items to request per page (at most MAX_IDS_PER_REQUEST)
             
-            # Get videos from the uploads playlist
-            playlist_items_response = self.youtube.playlistItems().list(
+        Yields:
+            Playlist items, in playlist order
+        """
+        page_token = None
+        
+        while True:
+            response = await self._execute(self.youtube.playlistItems().list(
                 part="snippet,contentDetails",
-                playlistId=uploads_playlist_id,
-                maxResults=limit
-            ).execute()
+                playlistId=playlist_id,
+                maxResults=page_size,
+                pageToken=page_token,
+                fields=PLAYLIST_ITEM_FIELDS
+            ))
+            
+            for item in response.get("items", []):
+                yield item
+            
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return
+    
+    async def fetch_content(self, start_date: Optional[str] = None, 
+                           end_date: Optional[str] = None, 
+                           limit: int = 10,
+                           include_stats: bool = False) -> Union[List[ContentItem], Tuple[List[ContentItem], Dict[str, ContentMetrics]]]:
+        """
+        Fetch YouTube videos for the configured channel.
+        
+        Args:
+            start_date: Start date for content (ISO format)
+            end_date: End date for content (ISO format)
+            limit: Maximum number of videos to fetch
+            include_stats: Whether to also fetch the videos' metrics, requested in the
+                same videos.list calls as their details instead of a later fetch_metrics
+            
+        Returns:
+            List of ContentItem objects, or a tuple of that list and a dictionary
+            mapping video IDs to ContentMetrics objects if include_stats is set
+        """
+        try:
+            # Convert dates to string keys once, so posts are filtered by plain string
+            # comparison instead of parsing every post's timestamp
+            start_key = utc_sort_key(start_date) if start_date else None
+            end_key = utc_sort_key(end_date) if end_date else None
             
-            content_items = []
+            # Without a date filter every item is kept, so pages only need to hold the
+            # limit; with one, full pages take fewer calls to find enough videos
+            page_size = MAX_IDS_PER_REQUEST if start_key or end_key else min(limit, MAX_IDS_PER_REQUEST)
             
-            for item in playlist_items_response["items"]:
-                video_id = item["contentDetails"]["videoId"]
+            # Keep the videos published in the date range, if provided, reading pages of
+            # the uploads playlist only until enough videos are found
+            published_by_id = {}
+            async for item in self._iter_playlist_items(await self._get_uploads_playlist_id(), page_size):
                 published_at = item["snippet"]["publishedAt"]
-                published_datetime = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                
-                # Filter by date if provided
-                if start_datetime and published_datetime < start_datetime:
-                    continue
-                if end_datetime and published_datetime > end_datetime:
-                    continue
+                published_key = utc_sort_key(published_at)
                 
-                # Get video details
-                video_response = self.youtube.videos().list(
-                    part="snippet,contentDetails",
-                    id=video_id
-                ).execute()
-                
-                if not video_response["items"]:
+                # The uploads playlist lists the newest videos first, so every later
+                # item is older than the range too
+                if start_key and published_key < start_key:
+                    break
+                if end_key and published_key > end_key:
                     continue
                 
-                video = video_response["items"][0]
-                
-                # Extract tags
-                tags = video["snippet"].get("tags", [])
-                
-                # Create ContentItem
-                content_item = ContentItem(
+                published_by_id[item["contentDetails"]["videoId"]] = published_at
+                if len(published_by_id) >= limit:
+                    break
+            
+            video_ids = list(published_by_id)
+            
+            # Reuse recently fetched video details, so only the other videos are requested;
+            # statistics go stale quickly, so every video is requested when they are included
+            videos_by_id = {}
+            missing_ids = []
+            now = time.monotonic()
+            for video_id in video_ids:
+                entry = self._video_cache.get(video_id)
+                if not include_stats and entry and now - entry[0] < VIDEO_CACHE_TTL:
+                    self._video_cache.move_to_end(video_id)
+                    videos_by_id[video_id] = entry[1]
+                else:
+                    missing_ids.append(video_id)
+            
+            # Get video details (and statistics, if included) for up to MAX_IDS_PER_REQUEST
+            # videos per request, with the requests running concurrently (the throttle caps
+            # how many run at once)
+            timestamp = datetime.utcnow().isoformat()
+            video_responses = await asyncio.gather(*[
+                self._execute(self.youtube.videos().list(
+                    part="snippet,statistics" if include_stats else "snippet",
+                    id=",".join(missing_ids[start:start + MAX_IDS_PER_REQUEST]),
+                    maxResults=MAX_IDS_PER_REQUEST,
+                    fields=VIDEO_DETAIL_STATISTICS_FIELDS if include_stats else VIDEO_DETAIL_FIELDS
+                ))
+                for start in range(0, len(missing_ids), MAX_IDS_PER_REQUEST)
+            ])
+            
+            fetched_at = time.monotonic()
+            for video_response in video_responses:
+                for video in video_response.get("items", []):
+                    videos_by_id[video["id"]] = video
+                    self._video_cache[video["id"]] = (fetched_at, video)
+                    self._video_cache.move_to_end(video["id"])
+            
+            while len(self._video_cache) > VIDEO_CACHE_SIZE:
+                self._video_cache.popitem(last=False)
+            
+            # Keep the playlist order, skipping videos the API did not return
+            content_items = [
+                # Create ContentItem, skipping validation since the API fields already have
+                # the declared types
+                ContentItem.construct(
                     id=video_id,
                     platform=Platform.YOUTUBE,
                     content_type=ContentType.VIDEO,
                     title=video["snippet"]["title"],
                     description=video["snippet"]["description"],
                     url=f"https://www.youtube.com/watch?v={video_id}",
-                    published_at=published_at,
-                    tags=tags
+                    published_at=published_by_id[video_id],
+                    tags=video["snippet"].get("tags", [])
                 )
-                
-                content_items.append(content_item)
-                
-                # Stop if we've reached the limit
-                if len(content_items) >= limit:
-                    break
+                for video_id in video_ids
+                if (video := videos_by_id.get(video_id)) is not None
+            ]
+            
+            if include_stats:
+                metrics = {
+                    item.id: self._create_metrics(item.id, videos_by_id[item.id].get("statistics", {}), timestamp)
+                    for item in content_items
+                }
+                return content_items, metrics
             
             return content_items
         
         except HttpError as e:
             print(f"YouTube API error: {e}")
-            return []
-        except Exception as e:
+            return ([], {}) if include_stats else []
+        except (HttpLib2Error, OSError) as e:
+            print(f"Network error fetching YouTube content: {e}")
+            return ([], {}) if include_stats else []
+        except (KeyError, ValueError) as e:
             print(f"Error fetching YouTube content: {e}")
-            return []
+            return ([], {}) if include_stats else []
     
     async def fetch_metrics(self, content_ids: List[str]) -> Dict[str, ContentMetrics]:
         """
@@ -135,39 +367,48 @@ class YouTubeConnector:
         Returns:
             Dictionary mapping video IDs to ContentMetrics objects
         """
+        # Metrics fetched together share one timestamp
+        timestamp = datetime.utcnow().isoformat()
+        
+        async def fetch_batch_metrics(batch: List[str]) -> Dict[str, ContentMetrics]:
+            # Get video statistics
+            video_response = await self._execute(self.youtube.videos().list(
+                part="statistics",
+                id=",".join(batch),
+                maxResults=MAX_IDS_PER_REQUEST,
+                fields=VIDEO_STATISTICS_FIELDS
+            ))
+            
+            stats_by_id = {item["id"]: item["statistics"] for item in video_response.get("items", [])}
+            
+            # Keep the requested order, skipping videos the API did not return
+            return {
+                video_id: self._create_metrics(video_id, stats, timestamp)
+                for video_id in batch
+                if (stats := stats_by_id.get(video_id)) is not None
+            }
+        
         try:
-            metrics = {}
+            # Fetch metrics for up to MAX_IDS_PER_REQUEST videos per request, with the
+            # requests running concurrently (the throttle caps how many run at once)
+            results = await asyncio.gather(*[
+                fetch_batch_metrics(content_ids[start:start + MAX_IDS_PER_REQUEST])
+                for start in range(0, len(content_ids), MAX_IDS_PER_REQUEST)
+            ])
             
-            # Fetch metrics for each video
-            for video_id in content_ids:
-                # Get video statistics
-                video_response = self.youtube.videos().list(
-                    part="statistics",
-                    id=video_id
-                ).execute()
-                
-                if not video_response["items"]:
-                    continue
-                
-                stats = video_response["items"][0]["statistics"]
-                
-                # Create ContentMetrics
-                metrics[video_id] = ContentMetrics.create(
-                    content_id=video_id,
-                    platform=Platform.YOUTUBE,
-                    views=int(stats.get("viewCount", 0)),
-                    likes=int(stats.get("likeCount", 0)),
-                    comments=int(stats.get("commentCount", 0)),
-                    # YouTube API doesn't provide shares or saves directly
-                    engagement_rate=self._calculate_engagement_rate(stats)
-                )
+            metrics = {}
+            for batch_metrics in results:
+                metrics.update(batch_metrics)
             
             return metrics
         
         except HttpError as e:
             print(f"YouTube API error: {e}")
             return {}
-        except Exception as e:
+        except (HttpLib2Error, OSError) as e:
+            print(f"Network error fetching YouTube metrics: {e}")
+            return {}
+        except (KeyError, ValueError) as e:
             print(f"Error fetching YouTube metrics: {e}")
             return {}
     
@@ -183,12 +424,13 @@ class YouTubeConnector:
             # and OAuth 2.0 authentication, which is beyond the scope of this example.
             # Here we're just fetching basic channel statistics.
             
-            channel_response = self.youtube.channels().list(
+            channel_response = await self._execute(self.youtube.channels().list(
                 part="statistics",
-                id=self.channel_id
-            ).execute()
+                id=self.channel_id,
+                fields=CHANNEL_STATISTICS_FIELDS
+            ))
             
-            if not channel_response["items"]:
+            if not channel_response.get("items"):
                 return None
             
             stats = channel_response["items"][0]["statistics"]
@@ -204,26 +446,55 @@ class YouTubeConnector:
         except HttpError as e:
             print(f"YouTube API error: {e}")
             return None
-        except Exception as e:
+        except (HttpLib2Error, OSError) as e:
+            print(f"Network error fetching YouTube audience data: {e}")
+            return None
+        except (KeyError, ValueError) as e:
             print(f"Error fetching YouTube audience data: {e}")
             return None
     
-    def _calculate_engagement_rate(self, stats: Dict[str, str]) -> float:
+    def _create_metrics(self, video_id: str, stats: Dict[str, str], timestamp: str) -> ContentMetrics:
         """
-        Calculate engagement rate for a YouTube video.
-        
-        Engagement rate = (likes + comments) / views * 100
+        Create metrics for a YouTube video from its statistics.
         
         Args:
-            stats: Video statistics from the YouTube API
+            video_id: YouTube video ID
+            stats: The video's statistics from the YouTube API
+            timestamp: Time the statistics were fetched (ISO format)
             
         Returns:
-            Engagement rate as a percentage
+            ContentMetrics object
         """
+        # The API returns counts as strings, so convert each once
         views = int(stats.get("viewCount", 0))
         likes = int(stats.get("likeCount", 0))
         comments = int(stats.get("commentCount", 0))
         
+        return ContentMetrics.create_unchecked(
+            content_id=video_id,
+            platform=Platform.YOUTUBE,
+            timestamp=timestamp,
+            views=views,
+            likes=likes,
+            comments=comments,
+            # YouTube API doesn't provide shares or saves directly
+            engagement_rate=self._calculate_engagement_rate(views, likes, comments)
+        )
+    
+    def _calculate_engagement_rate(self, views: int, likes: int, comments: int) -> float:
+        """
+        Calculate engagement rate for a YouTube video.
+        
+        Engagement rate = (likes + comments) / views * 100
+        
+        Args:
+            views: View count
+            likes: Like count
+            comments: Comment count
+            
+        Returns:
+            Engagement rate as a percentage
+        """
         if views == 0:
             return 0.0
         
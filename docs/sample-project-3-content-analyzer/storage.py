@@ -0,0 +1,50 @@
+import json
+from typing import Any
+
+from uagents.storage import KeyValueStore
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONStore(KeyValueStore):
+    """
+    File-backed key-value store for the content analyzer's data.
+    
+    Like KeyValueStore, the whole store is saved on every write, but it is
+    serialized with orjson when installed (compact standard-library JSON
+    otherwise) instead of indented standard-library JSON.
+    """
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get the value stored under a key.
+        
+        Args:
+            key: Key to look up
+            default: Value to return when the key is not stored
+        
+        Returns:
+            The stored value, or default
+        """
+        return self._data.get(key, default)
+    
+    def _load(self):
+        """
+        Load the store from its file.
+        """
+        with open(self._path, "rb") as file:
+            self._data = orjson.loads(file.read()) if orjson else json.load(file)
+    
+    def _save(self):
+        """
+        Save the store to its file.
+        """
+        if orjson:
+            with open(self._path, "wb") as file:
+                file.write(orjson.dumps(self._data))
+        else:
+            with open(self._path, "w", encoding="utf-8") as file:
+                json.dump(self._data, file, ensure_ascii=False, separators=(",", ":"))
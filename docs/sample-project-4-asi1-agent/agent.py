@@ -3,7 +3,7 @@ import os
 from enum import Enum
 from typing import Any
 
-from asi1 import get_completion
+from asi1 import aclose, aget_completion
 from uagents import Agent, Context, Model
 from uagents.experimental.quota import QuotaProtocol, RateLimit, AccessControlList
 from uagents_core.models import ErrorMessage
@@ -57,7 +57,7 @@ struct_proto = QuotaProtocol(
 @proto.on_message(ContextPrompt, replies={Response, ErrorMessage})
 async def handle_request(ctx: Context, sender: str, msg: ContextPrompt):
     ctx.logger.info(f"Received ContextPrompt from {sender}: context='{msg.context}', text='{msg.text}'")
-    response = get_completion(context=msg.context, prompt=msg.text)
+    response = await aget_completion(context=msg.context, prompt=msg.text)
     ctx.logger.info(f"Sending Response to {sender}: text='{response}'")
     await ctx.send(sender, Response(text=response))
 
@@ -68,7 +68,7 @@ async def handle_structured_request(
     ctx: Context, sender: str, msg: StructuredOutputPrompt
 ):
     ctx.logger.info(f"Received StructuredOutputPrompt from {sender}: prompt='{msg.prompt}', output_schema={msg.output_schema}")
-    response = get_completion(
+    response = await aget_completion(
         context="", prompt=msg.prompt, response_schema=msg.output_schema
     )
     try:
@@ -115,5 +115,9 @@ async def handle_health_check(ctx: Context, sender: str, msg: HealthCheck):
 
 agent.include(health_protocol, publish_manifest=True)
 
+@agent.on_event("shutdown")
+async def close_asi1_client(ctx: Context):
+    await aclose()
+
 if __name__ == "__main__":
     agent.run()
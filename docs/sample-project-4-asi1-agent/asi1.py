@@ -1,15 +1,36 @@
 import os
 import json
-import requests
+import time
+import asyncio
+import httpx
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
 from typing import Any
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 load_dotenv()
 
 ASI1_URL = "https://api.asi1.ai/v1/chat/completions"
 ASI1_MODEL = os.getenv("ASI1_MODEL", "asi1-mini")
 ASI1_API_KEY = os.getenv("ASI1_API_KEY", "YOUR_ASI1_API_KEY")
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", "1024"))
+COMPLETION_CACHE_SIZE = int(os.getenv("COMPLETION_CACHE_SIZE", "1024"))
+# Rate limited (429) and transient server (5xx) responses are retried up to
+# MAX_RETRIES times, waiting 1s, 2s, 4s... (at most MAX_BACKOFF) in between
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 4
+MAX_BACKOFF = 30.0
 HEADERS = {
     "Content-Type": "application/json",
     "Authorization": f"Bearer {ASI1_API_KEY}",
@@ -20,23 +41,39 @@ if ASI1_API_KEY is None or ASI1_API_KEY == "YOUR_ASI1_API_KEY":
         "You need to provide an ASI1 API key. Get one at https://asi1.ai/"
     )
 
-def get_completion(
+# One pooled client each for sync and async completions, so calls reuse
+# keep-alive connections
+_client = httpx.Client(
+    http2=HTTP2_AVAILABLE,
+    headers=HEADERS,
+    timeout=60,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+_aclient = httpx.AsyncClient(
+    http2=HTTP2_AVAILABLE,
+    headers=HEADERS,
+    timeout=60,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+
+# Payload fields that are the same for every completion, built once
+_BASE_PAYLOAD = {"model": ASI1_MODEL, "max_tokens": MAX_TOKENS}
+
+def _build_payload(
     context: str,
     prompt: str,
-    response_schema: dict[str, Any] | None = None,
-    max_tokens: int = MAX_TOKENS,
-) -> str:
+    response_schema: dict[str, Any] | None,
+    max_tokens: int,
+) -> dict[str, Any]:
     # ASI1 API is OpenAI-compatible, but may not support response_schema
     messages = []
     if context:
         messages.append({"role": "system", "content": context})
     messages.append({"role": "user", "content": prompt})
 
-    payload = {
-        "model": ASI1_MODEL,
-        "messages": messages,
-        "max_tokens": max_tokens,
-    }
+    payload = {**_BASE_PAYLOAD, "messages": messages}
+    if max_tokens != MAX_TOKENS:
+        payload["max_tokens"] = max_tokens
     if response_schema is not None:
         # If ASI1 supports response_format, add it here. Otherwise, ignore.
         payload["response_format"] = {
@@ -47,17 +84,110 @@ def get_completion(
                 "schema": response_schema,
             },
         }
+    return payload
+
+def _encode_payload(payload: dict[str, Any]) -> bytes:
+    # HEADERS already sets the JSON content type for the raw body. Keys are
+    # sorted so equal payloads encode to equal bytes, which key the cache
+    if orjson:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, sort_keys=True).encode()
+
+# Completions by encoded request body, least recently used first
+_completion_cache: OrderedDict[bytes, str] = OrderedDict()
+
+def _cached_completion(body: bytes) -> str | None:
+    completion = _completion_cache.get(body)
+    if completion is not None:
+        _completion_cache.move_to_end(body)
+    return completion
+
+def _cache_completion(body: bytes, completion: str) -> None:
+    _completion_cache[body] = completion
+    _completion_cache.move_to_end(body)
+    while len(_completion_cache) > COMPLETION_CACHE_SIZE:
+        _completion_cache.popitem(last=False)
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float | None:
+    # Seconds to wait before retrying, or None if the response should be kept.
+    # Retry-After is honored, unless it asks for longer than MAX_BACKOFF
+    if response.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+        return None
+    retry_after = response.headers.get("retry-after")
+    if not retry_after:
+        return min(MAX_BACKOFF, 2.0 ** attempt)
+    try:
+        delay = float(retry_after)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return min(MAX_BACKOFF, 2.0 ** attempt)
+    return max(0.0, delay) if delay <= MAX_BACKOFF else None
+
+def _post(body: bytes) -> httpx.Response:
+    attempt = 0
+    while True:
+        response = _client.post(ASI1_URL, content=body)
+        if (delay := _retry_delay(response, attempt)) is None:
+            return response
+        time.sleep(delay)
+        attempt += 1
+
+async def _apost(body: bytes) -> httpx.Response:
+    attempt = 0
+    while True:
+        response = await _aclient.post(ASI1_URL, content=body)
+        if (delay := _retry_delay(response, attempt)) is None:
+            return response
+        await asyncio.sleep(delay)
+        attempt += 1
 
+def _read_completion(response: httpx.Response) -> str:
+    response.raise_for_status()
+    data = orjson.loads(response.content) if orjson else response.json()
+    # ASI1 returns choices[0].message.content (OpenAI-compatible)
+    return data["choices"][0]["message"]["content"]
+
+def get_completion(
+    context: str,
+    prompt: str,
+    response_schema: dict[str, Any] | None = None,
+    max_tokens: int = MAX_TOKENS,
+    use_cache: bool = False,
+) -> str:
+    # Completions aren't deterministic, so reusing them for identical requests is opt-in
+    body = _encode_payload(_build_payload(context, prompt, response_schema, max_tokens))
+    if use_cache and (completion := _cached_completion(body)) is not None:
+        return completion
+    try:
+        completion = _read_completion(_post(body))
+    except (httpx.HTTPError, KeyError, IndexError, TypeError, ValueError) as e:
+        return f"An error occurred: {e}"
+    if use_cache:
+        _cache_completion(body, completion)
+    return completion
+
+async def aget_completion(
+    context: str,
+    prompt: str,
+    response_schema: dict[str, Any] | None = None,
+    max_tokens: int = MAX_TOKENS,
+    use_cache: bool = False,
+) -> str:
+    # Async variant for agent handlers: it doesn't block the event loop, and
+    # several completions can run at once with asyncio.gather
+    body = _encode_payload(_build_payload(context, prompt, response_schema, max_tokens))
+    if use_cache and (completion := _cached_completion(body)) is not None:
+        return completion
     try:
-        response = requests.post(
-            ASI1_URL,
-            headers=HEADERS,
-            data=json.dumps(payload),
-            timeout=60,
-        )
-        response.raise_for_status()
-        data = response.json()
-        # ASI1 returns choices[0].message.content (OpenAI-compatible)
-        return data["choices"][0]["message"]["content"]
-    except Exception as e:
+        completion = _read_completion(await _apost(body))
+    except (httpx.HTTPError, KeyError, IndexError, TypeError, ValueError) as e:
         return f"An error occurred: {e}"
+    if use_cache:
+        _cache_completion(body, completion)
+    return completion
+
+async def aclose() -> None:
+    # Close the async client's pooled connections (call on agent shutdown)
+    await _aclient.aclose()
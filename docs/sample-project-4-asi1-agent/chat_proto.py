@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from asi1 import get_completion
+from asi1 import aget_completion
 from uagents import Context, Protocol
 from uagents_core.contrib.protocols.chat import (
     ChatAcknowledgement,
@@ -36,7 +36,7 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
             ctx.logger.info(f"Got a message from {sender}: {item.text}")
             ctx.storage.set(str(ctx.session), sender)
 
-            completion = get_completion(context="", prompt=item.text)
+            completion = await aget_completion(context="", prompt=item.text)
 
             await ctx.send(sender, create_text_chat(completion))
         else:
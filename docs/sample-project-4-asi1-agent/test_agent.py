@@ -1,4 +1,3 @@
-import asyncio
 from datetime import datetime
 from uuid import uuid4
 
@@ -27,7 +26,6 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
     for item in msg.content:
         if isinstance(item, TextContent):
             print(f"\n{item.text}\n")
-    await asyncio.sleep(1)
 
 # Handler for ChatAcknowledgement
 @test_agent.on_message(model=ChatAcknowledgement)